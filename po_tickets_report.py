@@ -8,25 +8,38 @@ Filename: po_tickets_report.py
 
 import sys
 import csv
+import tempfile
 import getpass
 import warnings
 import os
 import logging
 import argparse
+import atexit
 import re
 import glob
+import gzip
+import html
+import functools
+import math
 import urllib.parse
 import smtplib
 import subprocess
-from collections import defaultdict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from collections import Counter, defaultdict
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
 from datetime import datetime, timedelta
 import json
+# Prefer orjson for faster response parsing when it is available
+try:
+    import orjson
+except ImportError:
+    orjson = None
 # Email-related imports
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.mime.base import MIMEBase
-from email import encoders
+from email.message import EmailMessage
 
 # Set up logging configuration
 logging.basicConfig(
@@ -62,6 +75,8 @@ add_firemon_paths()
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError:
     logging.error("Failed to import requests module after adding all possible paths")
     print("Error: Could not import requests module. Please check FireMon installation.")
@@ -70,6 +85,112 @@ except ImportError:
 # Suppress warnings for unverified HTTPS requests
 warnings.filterwarnings("ignore", message="Unverified HTTPS request")
 
+# Shared HTTP session so connections are kept alive and pooled across requests
+SESSION = requests.Session()
+SESSION.verify = False
+SESSION.headers.update({'Content-Type': 'application/json'})
+HTTP_POOL_SIZE = 32
+_adapter = HTTPAdapter(
+    pool_connections=HTTP_POOL_SIZE,
+    pool_maxsize=HTTP_POOL_SIZE,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504], raise_on_status=False)
+)
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+
+# Worker threads shared by every concurrent fetch phase, created on first use
+_http_executor = None
+_http_executor_lock = threading.Lock()
+
+def get_http_executor():
+    """Return the shared HTTP worker pool, sized to the session's connection pool."""
+    global _http_executor
+    with _http_executor_lock:
+        if _http_executor is None:
+            _http_executor = ThreadPoolExecutor(max_workers=HTTP_POOL_SIZE, thread_name_prefix='po-http')
+        return _http_executor
+
+# Run a call while holding a slot of the given semaphore
+def _call_limited(semaphore, func, *args):
+    """Call func(*args) with semaphore held to cap concurrency per fetch phase."""
+    with semaphore:
+        return func(*args)
+
+# Parse a JSON API response body
+def _loads(response):
+    """Parse a JSON response body, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+# Rule configuration fields that can be included in reports
+AVAILABLE_RULE_DETAIL_FIELDS = ['source', 'destination', 'service', 'application', 'action']
+
+# Default number of concurrent rule detail lookups
+DEFAULT_RULE_DETAIL_CONCURRENCY = 16
+
+# Number of ticket result pages fetched concurrently
+PAGE_FETCH_CONCURRENCY = 8
+
+# Maximum number of rules requested in one batched SIQL query
+RULE_BATCH_SIZE = 50
+
+# SIQL field selection used for rule detail lookups
+RULE_DETAIL_SIQL_FIELDS = "fields(tfacount, props, controlstat, usage(date('last 30 days')), change, highlight)"
+
+# Number of rendered HTML rows joined into each file write
+HTML_WRITE_BATCH_ROWS = 500
+
+# Markup for the fixed columns of an HTML report row, filled positionally with the
+# HTML_ROW_FIELDS values of a row
+HTML_ROW_TEMPLATE = """
+                <tr>
+                    <td><a href="%s" target="_blank">%s</a></td>
+                    <td>%s</td>
+                    <td>%s</td>
+                    <td>%s</td>
+                    <td>%s</td>
+                    <td><span class="status %s">%s</span></td>
+                    <td><a href="%s" target="_blank">%s</a></td>
+                    <td class="text-wrap">%s</td>
+                    <td>%s</td>
+                    <td class="text-wrap"><a href="%s" target="_blank">%s</a></td>"""
+HTML_ROW_FIELDS = (
+    'ticket_url', 'business_key', 'created_date', 'created_by', 'completed_date', 'assignee_completed',
+    'status_class', 'status', 'device_url', 'device_name', 'policy_name', 'rule_number', 'rule_url', 'rule_name'
+)
+HTML_DETAIL_CELL_TEMPLATE = """
+                    <td class="text-wrap">%s</td>"""
+HTML_ROW_END = """
+                </tr>"""
+
+# Status badge CSS classes for the known ticket statuses
+STATUS_CLASS = {'Review': 'status-review', 'Completed': 'status-completed', 'Cancelled': 'status-cancelled'}
+
+# Basic email address format accepted for report recipients
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+# Process-local cache of rule details keyed by (device_id, policy_guid, rule_guid)
+_rule_details_cache = {}
+_rule_details_cache_lock = threading.Lock()
+
+# Batched lookups already submitted, keyed like the cache; maps to (future, batch keys)
+_rule_details_in_flight = {}
+
+# On-disk rule details cache reused across runs; entries expire after the TTL (seconds). Rules
+# referenced only by closed tickets change less often and get the longer closed TTL
+RULE_CACHE_FILE = Path.home() / '.po_report_cache' / 'rule_details.json'
+DEFAULT_RULE_CACHE_TTL = 3600
+DEFAULT_RULE_CACHE_CLOSED_TTL = 86400
+
+# Expiry timestamps of rule details loaded from disk (None means the entry never expires)
+_rule_details_cache_expiry = {}
+
+# Answers to interactive prompts saved across runs and offered as defaults
+PROMPT_CACHE_FILE = Path.home() / '.po_tickets_prompts.json'
+_prompt_answers = {}
+_prompt_answers_changed = False
+
 # Load configuration from JSON file
 def load_config(config_path):
     """Load configuration from JSON file if it exists."""
@@ -100,8 +221,12 @@ def save_sample_config(filename="config_sample.json"):
         "days": 30,
         "csv": True,
         "html": True,
+        "html_gzip": False,
         "include_rule_details": True,
         "include_rule_docs": True,
+        "rule_detail_concurrency": 16,
+        "rule_cache_ttl": 3600,
+        "rule_cache_closed_ttl": 86400,
         "rule_detail_fields": [
             "source",
             "destination", 
@@ -139,11 +264,10 @@ def save_sample_config(filename="config_sample.json"):
 # Function to authenticate and get the token
 def authenticate(api_url, username, password):
     login_url = f"{api_url}/authentication/login"
-    headers = {'Content-Type': 'application/json'}
     payload = {'username': username, 'password': password}
     print("\n⏳ Authenticating with FireMon...")
     try:
-        response = requests.post(login_url, json=payload, headers=headers, verify=False)
+        response = SESSION.post(login_url, json=payload)
     except requests.exceptions.RequestException as e:
         logging.error("Error during authentication request: %s", e)
         print(f"❌ Authentication failed: {e}")
@@ -151,7 +275,8 @@ def authenticate(api_url, username, password):
         
     if response.status_code == 200:
         try:
-            token = response.json()['token']
+            token = _loads(response)['token']
+            SESSION.headers['X-FM-AUTH-Token'] = token
             logging.debug("Authentication token received.")
             print("✅ Authentication successful")
             return token
@@ -164,22 +289,23 @@ def authenticate(api_url, username, password):
         print(f"❌ Authentication failed: HTTP {response.status_code}")
         sys.exit(1)
 
+# Derive the Policy Optimizer API base URL from the Security Manager API URL
+@functools.lru_cache(maxsize=None)
+def policy_optimizer_api_url(api_url):
+    """Return the Policy Optimizer API base URL for a Security Manager API URL."""
+    return api_url.replace('/securitymanager/api', '/policyoptimizer/api')
+
 # Function to get available workflows
-def get_workflows(api_url, token):
+def get_workflows(api_url):
     """Fetch available workflows from Policy Optimizer."""
-    headers = {
-        'X-FM-AUTH-Token': token,
-        'Content-Type': 'application/json'
-    }
-    
-    url = f"{api_url.replace('/securitymanager/api', '/policyoptimizer/api')}/domain/1/workflow/?page=0&pageSize=100&search=&sort=name"
+    url = f"{policy_optimizer_api_url(api_url)}/domain/1/workflow/?page=0&pageSize=100&search=&sort=name"
     
     logging.debug(f"Fetching workflows from: {url}")
     
     try:
-        response = requests.get(url, headers=headers, verify=False, timeout=30)
+        response = SESSION.get(url, timeout=30)
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response)
             workflows = data.get('results', [])
             logging.info(f"Successfully fetched {len(workflows)} workflows")
             return workflows
@@ -191,13 +317,34 @@ def get_workflows(api_url, token):
     
     return []
 
-# Function to get Policy Optimizer tickets
-def get_po_tickets(api_url, token, workflow_id=2, status_filter=None, days_filter=None):
-    headers = {
-        'X-FM-AUTH-Token': token,
-        'Content-Type': 'application/json'
-    }
+# Fetch a single page of Policy Optimizer ticket search results
+def _fetch_ticket_page(page_url_template, page, echo=print):
+    """Fetch one page of the ticket search and return the parsed response; console output goes through echo."""
+    url = page_url_template.format(page=page)
     
+    try:
+        response = SESSION.get(url, timeout=30)
+    except requests.exceptions.RequestException as e:
+        logging.error(f"Error fetching tickets on page {page}: %s", e)
+        echo(f"   ❌ Error fetching tickets: {e}")
+        sys.exit(1)
+    
+    if response.status_code == 200:
+        try:
+            data = _loads(response)
+            logging.debug(f"Fetched {len(data.get('results', []))} tickets on page {page}")
+            return data
+        except ValueError:
+            logging.error("Failed to parse tickets from response.")
+            sys.exit(1)
+    else:
+        logging.error(f"Failed to fetch tickets: %s %s", response.status_code, response.text[:200])
+        echo(f"   ❌ Failed to fetch tickets (HTTP {response.status_code})")
+        sys.exit(1)
+
+# Function to get Policy Optimizer tickets
+def get_po_tickets(api_url, workflow_id=2, status_filter=None, days_filter=None, echo=print):
+    # Console output goes through echo so a background fetch can hold it back while prompts are shown
     # Build query based on filters
     if days_filter:
         if status_filter and status_filter.lower() != 'all':
@@ -211,111 +358,356 @@ def get_po_tickets(api_url, token, workflow_id=2, status_filter=None, days_filte
     
     encoded_query = urllib.parse.quote(query)
     
-    all_tickets = []
-    page = 0
     page_size = 100
+    # Build the page URL once; the encoded query has no literal braces, so only {page} is substituted
+    page_url_template = f"{policy_optimizer_api_url(api_url)}/siql/domain/1/review/paged-search?q={encoded_query}&pageSize={page_size}&sortdir=desc&sort=-createdDate&domainId=1&page={{page}}"
     
-    print(f"\n📋 Fetching Policy Optimizer tickets...")
-    print(f"   Workflow ID: {workflow_id}")
+    echo(f"\n📋 Fetching Policy Optimizer tickets...")
+    echo(f"   Workflow ID: {workflow_id}")
     if status_filter and status_filter.lower() != 'all':
-        print(f"   Filter: Status = {status_filter}")
+        echo(f"   Filter: Status = {status_filter}")
     if days_filter:
-        print(f"   Filter: Created in last {days_filter} days")
-    
-    while True:
-        url = f"{api_url.replace('/securitymanager/api', '/policyoptimizer/api')}/siql/domain/1/review/paged-search?q={encoded_query}&page={page}&pageSize={page_size}&sortdir=desc&sort=-createdDate&domainId=1"
-        
-        try:
-            response = requests.get(url, headers=headers, verify=False, timeout=30)
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Error fetching tickets on page {page}: %s", e)
-            print(f"   ❌ Error fetching tickets: {e}")
-            sys.exit(1)
-        
-        if response.status_code == 200:
-            try:
-                data = response.json()
-                tickets = data.get('results', [])
-                if not tickets:
-                    break
+        echo(f"   Filter: Created in last {days_filter} days")
+    
+    # Fetch the first page synchronously to learn the total ticket count
+    data = _fetch_ticket_page(page_url_template, 0, echo)
+    all_tickets = data.get('results', [])
+    total = data.get('total', data.get('totalCount'))
+    
+    if len(all_tickets) >= page_size:
+        if isinstance(total, int):
+            # Fetch the remaining pages concurrently, preserving page order
+            num_pages = math.ceil(total / page_size)
+            if num_pages > 1:
+                limit = threading.BoundedSemaphore(PAGE_FETCH_CONCURRENCY)
+                fetch_page = functools.partial(_call_limited, limit,
+                                               functools.partial(_fetch_ticket_page, page_url_template, echo=echo))
+                for page_data in get_http_executor().map(fetch_page, range(1, num_pages)):
+                    all_tickets.extend(page_data.get('results', []))
+        else:
+            # No total in the response envelope, so page sequentially until a short page
+            page = 1
+            while True:
+                tickets = _fetch_ticket_page(page_url_template, page, echo).get('results', [])
                 all_tickets.extend(tickets)
-                logging.debug(f"Fetched {len(tickets)} tickets on page {page}")
                 if len(tickets) < page_size:
                     break
                 page += 1
-            except KeyError:
-                logging.error("Failed to parse tickets from response.")
-                sys.exit(1)
-        else:
-            logging.error(f"Failed to fetch tickets: %s %s", response.status_code, response.text[:200])
-            print(f"   ❌ Failed to fetch tickets (HTTP {response.status_code})")
-            sys.exit(1)
     
-    print(f"   ✅ Fetched {len(all_tickets)} tickets")
+    echo(f"   ✅ Fetched {len(all_tickets)} tickets")
     logging.info(f"Total tickets fetched: {len(all_tickets)}")
     return all_tickets
 
-# Function to get rule details
-def get_rule_details(api_url, token, device_id, policy_guid, rule_guid):
-    headers = {
-        'X-FM-AUTH-Token': token,
-        'Content-Type': 'application/json'
-    }
-    
-    query = f"domain{{id=1}} and device{{id={device_id}}} and policy{{uid='{policy_guid}'}} and rule{{uid='{rule_guid}'}} | fields(tfacount, props, controlstat, usage(date('last 30 days')), change, highlight)"
+# Wait for a background ticket fetch and show the console output it held back
+def finish_ticket_fetch(tickets_future, fetch_messages):
+    """Return the fetched tickets; a failed fetch (including sys.exit) is re-raised after its messages are shown."""
+    wait([tickets_future])
+    for message in fetch_messages:
+        print(message)
+    return tickets_future.result()
+
+# End the run before the next prompt if the background ticket fetch has already failed
+def check_ticket_fetch(tickets_future, fetch_messages):
+    """Re-raise a failed background ticket fetch; a fetch that is running or succeeded is left alone."""
+    if tickets_future.done() and tickets_future.exception() is not None:
+        finish_ticket_fetch(tickets_future, fetch_messages)
+
+# Function to get rule details (cached for the lifetime of the process)
+def get_rule_details(api_url, device_id, policy_guid, rule_guid):
+    cache_key = (device_id, policy_guid, rule_guid)
+    with _rule_details_cache_lock:
+        if cache_key in _rule_details_cache:
+            return _rule_details_cache[cache_key]
+    
+    query = f"domain{{id=1}} and device{{id={device_id}}} and policy{{uid='{policy_guid}'}} and rule{{uid='{rule_guid}'}} | {RULE_DETAIL_SIQL_FIELDS}"
     encoded_query = urllib.parse.quote(query)
     
     url = f"{api_url}/siql/secrule/paged-search?q={encoded_query}"
     
+    rule_details = None
     try:
-        response = requests.get(url, headers=headers, verify=False, timeout=30)
+        response = SESSION.get(url, timeout=30)
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response)
             if data.get('results'):
-                return data['results'][0]
+                rule_details = data['results'][0]
     except:
         pass
     
-    return None
+    with _rule_details_cache_lock:
+        _rule_details_cache[cache_key] = rule_details
+    return rule_details
 
-# Process tickets to CSV with field selection and return discovered fields
-def process_tickets_to_csv(api_url, token, tickets, output_file, include_rule_details=False, 
-                          include_rule_docs=False, rule_detail_fields=None, rule_doc_fields=None):
-    print(f"\n📝 Generating CSV report...")
+# Function to get details for several rules of one policy with a single SIQL query
+def get_rule_details_batch(api_url, device_id, policy_guid, rule_guids):
+    """Fetch and cache details for up to RULE_BATCH_SIZE rules; returns {rule_guid: details} for rules found."""
+    rule_filter = ' or '.join(f"rule{{uid='{rule_guid}'}}" for rule_guid in rule_guids)
+    query = f"domain{{id=1}} and device{{id={device_id}}} and policy{{uid='{policy_guid}'}} and ({rule_filter}) | {RULE_DETAIL_SIQL_FIELDS}"
+    encoded_query = urllib.parse.quote(query)
     
-    # Default to all available fields if not specified
-    available_detail_fields = ['source', 'destination', 'service', 'application', 'action']
-    if rule_detail_fields is None:
-        rule_detail_fields = available_detail_fields
-    else:
-        # Validate requested fields
-        rule_detail_fields = [f for f in rule_detail_fields if f in available_detail_fields]
+    url = f"{api_url}/siql/secrule/paged-search?q={encoded_query}&page=0&pageSize={len(rule_guids)}"
     
-    # Scan to collect data and available prop fields
-    all_prop_fields = set()
-    tickets_with_details = []
+    found = {}
+    try:
+        response = SESSION.get(url, timeout=30)
+        if response.status_code == 200:
+            wanted = {rule_guid.lower(): rule_guid for rule_guid in rule_guids}
+            for rule in _loads(response).get('results', []):
+                result_guid = str(rule.get('matchId') or rule.get('uid') or '').lower()
+                if result_guid in wanted:
+                    found[wanted[result_guid]] = rule
+        else:
+            logging.debug(f"Batched rule lookup failed for device {device_id}: HTTP {response.status_code}")
+    except Exception as e:
+        logging.debug(f"Batched rule lookup failed for device {device_id}: {e}")
     
+    with _rule_details_cache_lock:
+        for rule_guid, rule_details in found.items():
+            _rule_details_cache[(device_id, policy_guid, rule_guid)] = rule_details
+    return found
+
+# Fetch rule details for all tickets concurrently, yielding them in ticket order
+def iter_rule_details_for_tickets(api_url, tickets, max_workers=DEFAULT_RULE_DETAIL_CONCURRENCY):
+    """Yield rule details for each ticket in order, as soon as the lookup covering it completes."""
+    ticket_keys = []
     for ticket in tickets:
-        ticket_data = {
-            'ticket': ticket,
-            'rule_details': None
-        }
+        variables = ticket.get('variables', {})
+        device_id = variables.get('deviceId', 'N/A')
+        rule_guid = variables.get('ruleGuid', '')
+        policy_guid = variables.get('policyGuid', '')
         
-        if include_rule_details or include_rule_docs:
-            variables = ticket.get('variables', {})
-            device_id = variables.get('deviceId', 'N/A')
-            rule_guid = variables.get('ruleGuid', '')
-            policy_guid = variables.get('policyGuid', '')
+        if rule_guid and policy_guid and device_id != 'N/A':
+            ticket_keys.append((device_id, policy_guid, rule_guid))
+        else:
+            ticket_keys.append(None)
+    
+    # Only fetch each unique rule once, skipping rules already cached or being fetched for another
+    # caller; checking and registering under one lock keeps concurrent report writers from duplicating lookups
+    rule_details_by_key = {}
+    batch_for_key = {}
+    executor = get_http_executor()
+    limit = threading.BoundedSemaphore(max_workers)
+    with _rule_details_cache_lock:
+        for key in set(ticket_keys):
+            if key is None:
+                continue
+            if key in _rule_details_cache:
+                rule_details_by_key[key] = _rule_details_cache[key]
+            elif key in _rule_details_in_flight:
+                batch_for_key[key] = _rule_details_in_flight[key]
+        pending_keys = {key for key in ticket_keys
+                        if key is not None and key not in rule_details_by_key and key not in batch_for_key}
+        
+        # Submit every batch up front; each pending key maps to the (future, batch) that covers it
+        if pending_keys:
+            # Group rules by device and policy so each group can be fetched in batched queries
+            rules_by_policy = defaultdict(list)
+            for device_id, policy_guid, rule_guid in pending_keys:
+                rules_by_policy[(device_id, policy_guid)].append(rule_guid)
             
-            if rule_guid and policy_guid and device_id != 'N/A':
-                rule_details = get_rule_details(api_url, token, device_id, policy_guid, rule_guid)
-                if rule_details:
-                    ticket_data['rule_details'] = rule_details
-                    if include_rule_docs:
-                        props = rule_details.get('props', {})
-                        all_prop_fields.update(props.keys())
-        
-        tickets_with_details.append(ticket_data)
+            logging.debug(f"Fetching details for {len(pending_keys)} unique rules in {len(rules_by_policy)} policies with {max_workers} concurrent requests")
+            for (device_id, policy_guid), rule_guids in rules_by_policy.items():
+                for i in range(0, len(rule_guids), RULE_BATCH_SIZE):
+                    batch = [(device_id, policy_guid, rule_guid) for rule_guid in rule_guids[i:i + RULE_BATCH_SIZE]]
+                    future = executor.submit(_call_limited, limit, get_rule_details_batch, api_url,
+                                             device_id, policy_guid, [key[2] for key in batch])
+                    for key in batch:
+                        batch_for_key[key] = _rule_details_in_flight[key] = (future, batch)
+    
+    # Wait only for the lookup covering the next ticket, so consumers can work while later batches are in flight
+    fallback_futures = {}
+    for key in ticket_keys:
+        if key is None:
+            yield None
+            continue
+        if key not in rule_details_by_key:
+            if key not in fallback_futures:
+                future, batch = batch_for_key[key]
+                found = future.result()
+                missing_keys = []
+                for batch_key in batch:
+                    if batch_key[2] in found:
+                        rule_details_by_key[batch_key] = found[batch_key[2]]
+                    else:
+                        missing_keys.append(batch_key)
+                # Fall back to individual lookups for rules the batched query did not return
+                if missing_keys:
+                    logging.debug(f"Falling back to individual lookups for {len(missing_keys)} rules")
+                    for missing_key in missing_keys:
+                        fallback_futures[missing_key] = executor.submit(_call_limited, limit, get_rule_details,
+                                                                        api_url, *missing_key)
+            if key in fallback_futures:
+                rule_details_by_key[key] = fallback_futures.pop(key).result()
+        yield rule_details_by_key[key]
+
+# Fetch rule details for all tickets concurrently
+def fetch_rule_details_for_tickets(api_url, tickets, max_workers=DEFAULT_RULE_DETAIL_CONCURRENCY):
+    """Fetch rule details for each ticket concurrently; results align with tickets."""
+    return list(iter_rule_details_for_tickets(api_url, tickets, max_workers))
+
+# Write JSON data to a file atomically
+def write_json_atomic(path, data, **dump_kwargs):
+    """Replace path with data as JSON via a uniquely named temporary file in the same directory."""
+    # A unique temporary name keeps overlapping runs from writing into the same file, and
+    # os.replace means an interrupted run never leaves a truncated file behind
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, **dump_kwargs)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+# Seed the rule details cache from the on-disk cache
+def load_rule_details_cache(api_url):
+    """Load unexpired rule details cached by earlier runs against this host; returns the entry count."""
+    try:
+        with open(RULE_CACHE_FILE, 'r', encoding='utf-8') as f:
+            entries = json.load(f).get(api_url, [])
+        if not isinstance(entries, list):
+            raise ValueError(f"expected a list of entries, got {type(entries).__name__}")
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError, AttributeError) as e:
+        logging.warning(f"Ignoring unreadable rule details cache {RULE_CACHE_FILE}: {e}")
+        return 0
+    
+    now = time.time()
+    loaded = 0
+    skipped = 0
+    with _rule_details_cache_lock:
+        for entry in entries:
+            # Skip malformed or older-format entries instead of failing the run
+            try:
+                device_id, policy_guid, rule_guid, expires, rule_details = entry
+                key = (device_id, policy_guid, rule_guid)
+                if expires is not None and expires <= now:
+                    continue
+                _rule_details_cache[key] = rule_details
+            except (TypeError, ValueError):
+                skipped += 1
+                continue
+            _rule_details_cache_expiry[key] = expires
+            loaded += 1
+    if skipped:
+        logging.warning(f"Ignoring {skipped} unreadable entries in rule details cache {RULE_CACHE_FILE}")
+    logging.info(f"Loaded {loaded} rule details from {RULE_CACHE_FILE}")
+    return loaded
+
+# Persist the rule details cache for later runs
+def save_rule_details_cache(api_url, tickets, ttl=DEFAULT_RULE_CACHE_TTL, closed_ttl=DEFAULT_RULE_CACHE_CLOSED_TTL):
+    """Save fetched rule details for this host; rules only referenced by closed tickets use the longer closed TTL."""
+    # Rule details are live data on the rule, so rules with open tickets get the short TTL
+    open_keys = set()
+    for ticket in tickets:
+        if ticket.get('status') not in ('Completed', 'Cancelled'):
+            variables = ticket.get('variables', {})
+            open_keys.add((variables.get('deviceId', 'N/A'), variables.get('policyGuid', ''), variables.get('ruleGuid', '')))
+    
+    now = time.time()
+    open_expires_at = now + ttl
+    closed_expires_at = now + closed_ttl
+    entries = []
+    with _rule_details_cache_lock:
+        for key, rule_details in _rule_details_cache.items():
+            # Failed lookups are not persisted so the next run retries them
+            if rule_details is None:
+                continue
+            expires = open_expires_at if key in open_keys else closed_expires_at
+            # Entries loaded from disk keep their earlier expiry unless this run's TTL ends sooner,
+            # e.g. a rule cached for a closed ticket that now has an open one (None is from older caches)
+            cached_expires = _rule_details_cache_expiry.get(key)
+            if cached_expires is not None:
+                expires = min(expires, cached_expires)
+            entries.append([*key, expires, rule_details])
+    
+    try:
+        try:
+            with open(RULE_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cache_data = json.load(f)
+        except (OSError, ValueError):
+            cache_data = {}
+        if not isinstance(cache_data, dict):
+            cache_data = {}
+        cache_data[api_url] = entries
+        write_json_atomic(RULE_CACHE_FILE, cache_data)
+        logging.info(f"Saved {len(entries)} rule details to {RULE_CACHE_FILE}")
+    except OSError as e:
+        logging.warning(f"Could not save rule details cache {RULE_CACHE_FILE}: {e}")
+
+# Format an ISO-8601 timestamp from the API as 'YYYY-MM-DD HH:MM:SS'
+def format_timestamp(value):
+    """Format an API timestamp for reports without a datetime round-trip when possible."""
+    # The display format is the date and time portion of the ISO string, so slice it directly
+    if len(value) >= 19 and value[10] == 'T':
+        return value[:10] + ' ' + value[11:19]
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value).strftime('%Y-%m-%d %H:%M:%S')
+
+# Rule detail extractors, one per supported rule detail field
+def _extract_source(rule_details):
+    return ', '.join(src.get('displayName', 'N/A') for src in rule_details.get('sources', [])) or 'Any'
+
+def _extract_destination(rule_details):
+    return ', '.join(dst.get('displayName', 'N/A') for dst in rule_details.get('destinations', [])) or 'Any'
+
+def _extract_service(rule_details):
+    entries = chain.from_iterable(svc.get('services', []) for svc in rule_details.get('services', []))
+    return ', '.join(entry.get('formattedValue', 'N/A') for entry in entries) or 'Any'
+
+def _extract_application(rule_details):
+    app_names = (app.get('displayName', 'N/A') for app in rule_details.get('apps', [])
+                 if app.get('displayName') != 'Any')
+    return ', '.join(app_names) or 'Any'
+
+def _extract_action(rule_details):
+    return rule_details.get('ruleAction', 'N/A')
+
+RULE_DETAIL_EXTRACTORS = {
+    'source': _extract_source,
+    'destination': _extract_destination,
+    'service': _extract_service,
+    'application': _extract_application,
+    'action': _extract_action,
+}
+
+# Resolve requested rule detail fields against the supported list
+def resolve_rule_detail_fields(rule_detail_fields=None):
+    """Return the requested rule detail fields that are supported (default: all)."""
+    if rule_detail_fields is None:
+        return list(AVAILABLE_RULE_DETAIL_FIELDS)
+    return [f for f in rule_detail_fields if f in AVAILABLE_RULE_DETAIL_FIELDS]
+
+# Fetch rule details for the tickets and determine which rule doc fields to include
+def collect_rule_details(api_url, tickets, include_rule_details=False, include_rule_docs=False,
+                         rule_doc_fields=None, rule_detail_concurrency=DEFAULT_RULE_DETAIL_CONCURRENCY):
+    """Return (rule_details_list, sorted_prop_fields, discovered_prop_fields) for the tickets.
+    
+    rule_details_list is None when the report columns do not depend on the fetched
+    details, in which case iter_enriched_tickets streams them while rows are written.
+    """
+    # Rule doc columns are discovered from the fetched props, so those need every lookup up front
+    if include_rule_docs:
+        print(f"\n🔍 Fetching rule details...")
+        rule_details_list = fetch_rule_details_for_tickets(api_url, tickets, rule_detail_concurrency)
+    elif include_rule_details:
+        print(f"\n🔍 Fetching rule details while writing reports...")
+        rule_details_list = None
+    else:
+        rule_details_list = [None] * len(tickets)
+    
+    # Collect all unique prop fields
+    all_prop_fields = set()
+    if include_rule_docs:
+        for rule_details in rule_details_list:
+            if rule_details:
+                all_prop_fields.update(rule_details.get('props', {}).keys())
     
     # Determine which prop fields to include
     if include_rule_docs:
@@ -332,198 +724,60 @@ def process_tickets_to_csv(api_url, token, tickets, output_file, include_rule_de
     else:
         sorted_prop_fields = []
     
-    with open(output_file, mode='w', newline='', encoding='utf-8') as file:
-        # Define CSV headers
-        headers = [
-            'Ticket ID', 'Created Date', 'Completed Date', 'Status', 
-            'Device Name', 'Device ID', 'Policy Name', 'Rule Number', 'Rule Name',
-            'Assignee/Completed By', 'Created By'
-        ]
-        
-        # Add selected rule detail fields
-        if include_rule_details:
-            for field in rule_detail_fields:
-                headers.append(field.title())
-        
-        # Add selected prop fields
-        if include_rule_docs and sorted_prop_fields:
-            for field in sorted_prop_fields:
-                header_name = field.replace('_', ' ').title()
-                headers.append(f'Rule Doc: {header_name}')
-        
-        writer = csv.DictWriter(file, fieldnames=headers)
-        writer.writeheader()
-        
-        row_count = 0
-        for ticket_data in tickets_with_details:
-            ticket = ticket_data['ticket']
-            rule_details = ticket_data.get('rule_details')
-            
-            try:
-                # Extract basic ticket info
-                business_key = ticket.get('businessKey', 'N/A')
-                created_date = ticket.get('createdDate', 'N/A')
-                completed_date = ticket.get('completed', 'N/A')
-                status = ticket.get('status', 'N/A')
-                
-                # Format dates
-                if created_date != 'N/A':
-                    created_date = datetime.fromisoformat(created_date.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M:%S')
-                if completed_date != 'N/A':
-                    completed_date = datetime.fromisoformat(completed_date.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M:%S')
-                
-                # Extract variables
-                variables = ticket.get('variables', {})
-                device_name = variables.get('deviceName', 'N/A')
-                device_id = variables.get('deviceId', 'N/A')
-                policy_name = variables.get('policyDisplayName', variables.get('policyName', 'N/A'))
-                rule_number = variables.get('ruleNumber', 'N/A')
-                
-                # Get assignee or completedBy
-                assignee_completed = 'N/A'
-                if status == 'Review':
-                    assignee = ticket.get('assignee', {})
-                    if assignee:
-                        assignee_completed = assignee.get('displayName', assignee.get('username', 'N/A'))
-                elif status in ['Completed', 'Cancelled']:
-                    completed_by = ticket.get('completedBy', {})
-                    if completed_by:
-                        assignee_completed = completed_by.get('displayName', completed_by.get('username', 'N/A'))
-                
-                # Get created by
-                created_by = ticket.get('createdBy', {})
-                created_by_name = created_by.get('displayName', created_by.get('username', 'N/A')) if created_by else 'N/A'
-                
-                # Initialize row data
-                row_data = {
-                    'Ticket ID': business_key,
-                    'Created Date': created_date,
-                    'Completed Date': completed_date if completed_date != 'N/A' else '',
-                    'Status': status,
-                    'Device Name': device_name,
-                    'Device ID': device_id,
-                    'Policy Name': policy_name,
-                    'Rule Number': rule_number,
-                    'Rule Name': 'N/A',
-                    'Assignee/Completed By': assignee_completed,
-                    'Created By': created_by_name
-                }
-                
-                # Add rule name if we have rule details
-                if rule_details:
-                    row_data['Rule Name'] = rule_details.get('ruleName', 'N/A')
-                
-                # Add selected rule configuration details
-                if include_rule_details:
-                    if rule_details:
-                        if 'source' in rule_detail_fields:
-                            sources = rule_details.get('sources', [])
-                            source_names = [src.get('displayName', 'N/A') for src in sources]
-                            row_data['Source'] = ', '.join(source_names) if source_names else 'Any'
-                        
-                        if 'destination' in rule_detail_fields:
-                            destinations = rule_details.get('destinations', [])
-                            dest_names = [dst.get('displayName', 'N/A') for dst in destinations]
-                            row_data['Destination'] = ', '.join(dest_names) if dest_names else 'Any'
-                        
-                        if 'service' in rule_detail_fields:
-                            services = rule_details.get('services', [])
-                            service_names = []
-                            for svc in services:
-                                svc_entries = svc.get('services', [])
-                                for entry in svc_entries:
-                                    service_names.append(entry.get('formattedValue', 'N/A'))
-                            row_data['Service'] = ', '.join(service_names) if service_names else 'Any'
-                        
-                        if 'application' in rule_detail_fields:
-                            apps = rule_details.get('apps', [])
-                            app_names = [app.get('displayName', 'N/A') for app in apps if app.get('displayName') != 'Any']
-                            row_data['Application'] = ', '.join(app_names) if app_names else 'Any'
-                        
-                        if 'action' in rule_detail_fields:
-                            row_data['Action'] = rule_details.get('ruleAction', 'N/A')
-                    else:
-                        # No rule details available, fill with N/A
-                        for field in rule_detail_fields:
-                            row_data[field.title()] = 'N/A'
-                
-                # Add selected rule documentation fields
-                if include_rule_docs and sorted_prop_fields:
-                    if rule_details:
-                        props = rule_details.get('props', {})
-                        for field in sorted_prop_fields:
-                            header_name = f'Rule Doc: {field.replace("_", " ").title()}'
-                            row_data[header_name] = props.get(field, 'N/A')
-                    else:
-                        for field in sorted_prop_fields:
-                            header_name = f'Rule Doc: {field.replace("_", " ").title()}'
-                            row_data[header_name] = 'N/A'
-                
-                writer.writerow(row_data)
-                row_count += 1
-                
-            except Exception as e:
-                logging.error(f"Error processing ticket {ticket.get('businessKey', 'unknown')}: {e}")
-                continue
-    
-    print(f"✅ CSV report generated with {row_count} rows")
-    if include_rule_details:
-        print(f"   📋 Included rule detail fields: {', '.join(rule_detail_fields)}")
-    if include_rule_docs and sorted_prop_fields:
-        print(f"   📋 Included {len(sorted_prop_fields)} rule doc fields: {', '.join(sorted_prop_fields)}")
-    return row_count
+    return rule_details_list, sorted_prop_fields, sorted(list(all_prop_fields))
+
+# Turn a field name such as 'change_control_number' into a column display name
+@functools.lru_cache(maxsize=None)
+def _pretty_field_name(field):
+    return field.replace('_', ' ').title()
 
-# Generate HTML report with field selection and return discovered fields
-def generate_html_report(api_url, token, tickets, output_html, include_rule_details=False, 
-                        include_rule_docs=False, rule_detail_fields=None, rule_doc_fields=None):
-    print(f"\n📊 Generating HTML report...")
+# Build display names for rule doc columns
+def rule_doc_header_names(sorted_prop_fields):
+    """Return the column display name for each rule doc prop field."""
+    return [_pretty_field_name(field) for field in sorted_prop_fields]
+
+# Normalize tickets into report rows shared by the CSV and HTML generators
+def iter_enriched_tickets(api_url, tickets, rule_details_list, include_rule_details=False,
+                          include_rule_docs=False, rule_detail_fields=None,
+                          rule_detail_concurrency=DEFAULT_RULE_DETAIL_CONCURRENCY):
+    """Yield one normalized report row per ticket, building rows only as they are consumed."""
+    rule_detail_fields = resolve_rule_detail_fields(rule_detail_fields)
+    
+    # Without prefetched details, overlap the lookups with row writing; later passes hit the cache
+    if rule_details_list is None:
+        rule_details_list = iter_rule_details_for_tickets(api_url, tickets, rule_detail_concurrency)
     
     # Extract base URL from api_url
     base_url = api_url.replace('/securitymanager/api', '').replace('/api', '')
     
-    # Calculate summary statistics
-    review_count = sum(1 for t in tickets if t.get('status') == 'Review')
-    completed_count = sum(1 for t in tickets if t.get('status') == 'Completed')
-    cancelled_count = sum(1 for t in tickets if t.get('status') == 'Cancelled')
-    total_count = len(tickets)
-    
-    # Default to all available fields if not specified
-    available_detail_fields = ['source', 'destination', 'service', 'application', 'action']
-    if rule_detail_fields is None:
-        rule_detail_fields = available_detail_fields
-    else:
-        rule_detail_fields = [f for f in rule_detail_fields if f in available_detail_fields]
-    
-    # Scan to collect all unique prop fields
-    all_prop_fields = set()
-    tickets_data = []
-    
-    for ticket in tickets:
+    for ticket, rule_details in zip(tickets, rule_details_list):
         try:
+            ticket_get = ticket.get
+            
             # Extract basic ticket info
-            business_key = ticket.get('businessKey', 'N/A')
-            ticket_id = ticket.get('id', '')
-            created_date = ticket.get('createdDate', 'N/A')
-            completed_date = ticket.get('completed', 'N/A')
-            status = ticket.get('status', 'N/A')
+            business_key = ticket_get('businessKey', 'N/A')
+            ticket_id = ticket_get('id', '')
+            created_date = ticket_get('createdDate', 'N/A')
+            completed_date = ticket_get('completed', 'N/A')
+            status = ticket_get('status', 'N/A')
             
             # Format dates
             if created_date != 'N/A':
-                created_date = datetime.fromisoformat(created_date.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M:%S')
+                created_date = format_timestamp(created_date)
             if completed_date != 'N/A':
-                completed_date = datetime.fromisoformat(completed_date.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M:%S')
+                completed_date = format_timestamp(completed_date)
             
             # Extract variables
-            variables = ticket.get('variables', {})
-            device_name = variables.get('deviceName', 'N/A')
-            device_id = variables.get('deviceId', 'N/A')
-            policy_name = variables.get('policyDisplayName', variables.get('policyName', 'N/A'))
-            rule_number = variables.get('ruleNumber', 'N/A')
-            rule_guid = variables.get('ruleGuid', '')
-            policy_guid = variables.get('policyGuid', '')
+            variables_get = ticket_get('variables', {}).get
+            device_name = variables_get('deviceName', 'N/A')
+            device_id = variables_get('deviceId', 'N/A')
+            policy_name = variables_get('policyDisplayName', variables_get('policyName', 'N/A'))
+            rule_number = variables_get('ruleNumber', 'N/A')
+            rule_guid = variables_get('ruleGuid', '')
+            policy_guid = variables_get('policyGuid', '')
             
             # Get workflow info
-            workflow_version = ticket.get('workflowVersion', {})
+            workflow_version = ticket_get('workflowVersion', {})
             workflow = workflow_version.get('workflow', {}) if workflow_version else {}
             workflow_id = workflow.get('id', 2)
             
@@ -535,19 +789,19 @@ def generate_html_report(api_url, token, tickets, output_html, include_rule_deta
             # Get assignee or completedBy
             assignee_completed = 'N/A'
             if status == 'Review':
-                assignee = ticket.get('assignee', {})
+                assignee = ticket_get('assignee', {})
                 if assignee:
                     assignee_completed = assignee.get('displayName', assignee.get('username', 'N/A'))
             elif status in ['Completed', 'Cancelled']:
-                completed_by = ticket.get('completedBy', {})
+                completed_by = ticket_get('completedBy', {})
                 if completed_by:
                     assignee_completed = completed_by.get('displayName', completed_by.get('username', 'N/A'))
             
             # Get created by
-            created_by = ticket.get('createdBy', {})
+            created_by = ticket_get('createdBy', {})
             created_by_name = created_by.get('displayName', created_by.get('username', 'N/A')) if created_by else 'N/A'
             
-            ticket_data = {
+            row = {
                 'business_key': business_key,
                 'ticket_url': ticket_url,
                 'created_date': created_date,
@@ -556,6 +810,7 @@ def generate_html_report(api_url, token, tickets, output_html, include_rule_deta
                 'assignee_completed': assignee_completed,
                 'status': status,
                 'device_name': device_name,
+                'device_id': device_id,
                 'device_url': device_url,
                 'policy_name': policy_name,
                 'rule_number': rule_number,
@@ -564,135 +819,165 @@ def generate_html_report(api_url, token, tickets, output_html, include_rule_deta
                 'props': {}
             }
             
-            # Fetch rule details if requested
-            if (include_rule_details or include_rule_docs) and rule_guid and policy_guid and device_id != 'N/A':
-                rule_details = get_rule_details(api_url, token, device_id, policy_guid, rule_guid)
-                if rule_details:
-                    ticket_data['rule_name'] = rule_details.get('ruleName', 'N/A')
-                    
-                    # Extract selected rule configuration fields
-                    if include_rule_details:
-                        if 'source' in rule_detail_fields:
-                            sources = rule_details.get('sources', [])
-                            source_names = [src.get('displayName', 'N/A') for src in sources]
-                            ticket_data['source'] = ', '.join(source_names) if source_names else 'Any'
-                        
-                        if 'destination' in rule_detail_fields:
-                            destinations = rule_details.get('destinations', [])
-                            dest_names = [dst.get('displayName', 'N/A') for dst in destinations]
-                            ticket_data['destination'] = ', '.join(dest_names) if dest_names else 'Any'
-                        
-                        if 'service' in rule_detail_fields:
-                            services = rule_details.get('services', [])
-                            service_names = []
-                            for svc in services:
-                                svc_entries = svc.get('services', [])
-                                for entry in svc_entries:
-                                    service_names.append(entry.get('formattedValue', 'N/A'))
-                            ticket_data['service'] = ', '.join(service_names) if service_names else 'Any'
-                        
-                        if 'application' in rule_detail_fields:
-                            apps = rule_details.get('apps', [])
-                            app_names = [app.get('displayName', 'N/A') for app in apps if app.get('displayName') != 'Any']
-                            ticket_data['application'] = ', '.join(app_names) if app_names else 'Any'
-                        
-                        if 'action' in rule_detail_fields:
-                            ticket_data['action'] = rule_details.get('ruleAction', 'N/A')
-                    
-                    # Extract and store prop fields
-                    if include_rule_docs:
-                        props = rule_details.get('props', {})
-                        ticket_data['props'] = props
-                        all_prop_fields.update(props.keys())
+            # Default rule detail fields to N/A when details are unavailable
+            if include_rule_details:
+                for field in rule_detail_fields:
+                    row[field] = 'N/A'
             
-            tickets_data.append(ticket_data)
+            # Add rule details if available
+            if rule_details:
+                row['rule_name'] = rule_details.get('ruleName', 'N/A')
+                
+                # Extract selected rule configuration fields
+                if include_rule_details:
+                    for field in rule_detail_fields:
+                        row[field] = RULE_DETAIL_EXTRACTORS[field](rule_details)
+                
+                # Store prop fields
+                if include_rule_docs:
+                    row['props'] = rule_details.get('props', {})
             
         except Exception as e:
-            logging.error(f"Error processing ticket for HTML: {e}")
+            logging.error(f"Error processing ticket {ticket.get('businessKey', 'unknown')}: {e}")
             continue
-    
-    # Determine which prop fields to include
-    if include_rule_docs:
-        if rule_doc_fields is None:
-            sorted_prop_fields = sorted(list(all_prop_fields))
-        else:
-            sorted_prop_fields = [f for f in rule_doc_fields if f in all_prop_fields]
-    else:
-        sorted_prop_fields = []
-    
-    # Calculate dynamic table width
-    base_columns = 10
-    extra_columns = len(rule_detail_fields) if include_rule_details else 0
-    prop_columns = len(sorted_prop_fields) if include_rule_docs else 0
-    total_columns = base_columns + extra_columns + prop_columns
-    min_width = max(1400, total_columns * 120)
-    
-    # Generate HTML content with page scrollbars and sticky table headers
-    html_content = f"""<!DOCTYPE html>
+        
+        yield row
+
+# Console lines listing the rule fields a report includes
+def included_fields_summary(include_rule_details, include_rule_docs, rule_detail_fields, sorted_prop_fields):
+    """Return the 'Included ... fields' lines printed under a report's result."""
+    lines = []
+    if include_rule_details:
+        lines.append(f"   📋 Included rule detail fields: {', '.join(rule_detail_fields)}")
+    if include_rule_docs and sorted_prop_fields:
+        lines.append(f"   📋 Included {len(sorted_prop_fields)} rule doc fields: {', '.join(sorted_prop_fields)}")
+    return lines
+
+# Write report rows to CSV with field selection
+def process_tickets_to_csv(rows, output_file, include_rule_details=False, include_rule_docs=False,
+                          rule_detail_fields=None, sorted_prop_fields=None, prop_headers=None):
+    """Write the CSV report and return (row_count, bytes_written, summary_lines).
+
+    The summary lines are returned rather than printed because the report writers run concurrently.
+    """
+    rule_detail_fields = resolve_rule_detail_fields(rule_detail_fields)
+    sorted_prop_fields = sorted_prop_fields or []
+    
+    # Define CSV headers and the row keys that feed each column, in the same order
+    headers = [
+        'Ticket ID', 'Created Date', 'Completed Date', 'Status', 
+        'Device Name', 'Device ID', 'Policy Name', 'Rule Number', 'Rule Name',
+        'Assignee/Completed By', 'Created By'
+    ]
+    field_keys = [
+        'business_key', 'created_date', 'completed_date', 'status',
+        'device_name', 'device_id', 'policy_name', 'rule_number', 'rule_name',
+        'assignee_completed', 'created_by'
+    ]
+    
+    # Add selected rule detail fields
+    if include_rule_details:
+        for field in rule_detail_fields:
+            headers.append(_pretty_field_name(field))
+            field_keys.append(field)
+    
+    # Add selected prop fields
+    prop_fields = sorted_prop_fields if include_rule_docs else []
+    if prop_fields:
+        if prop_headers is None:
+            prop_headers = rule_doc_header_names(prop_fields)
+        headers.extend(f'Rule Doc: {header_name}' for header_name in prop_headers)
+    
+    # Pull the base columns out of each row in one C-level call; missing rule doc values show as N/A
+    get_values = itemgetter(*field_keys)
+    row_count = 0
+    
+    def iter_values():
+        nonlocal row_count
+        for row in rows:
+            values = get_values(row)
+            if prop_fields:
+                get_prop = (row['props'] or {}).get
+                values += tuple([get_prop(field, 'N/A') for field in prop_fields])
+            row_count += 1
+            yield values
+    
+    with open(output_file, mode='w', newline='', encoding='utf-8', buffering=1 << 20) as file:
+        writer = csv.writer(file)
+        writer.writerow(headers)
+        writer.writerows(iter_values())
+        bytes_written = file.tell()
+    
+    summary_lines = [f"✅ CSV report generated with {row_count} rows"]
+    summary_lines += included_fields_summary(include_rule_details, include_rule_docs, rule_detail_fields, sorted_prop_fields)
+    return row_count, bytes_written, summary_lines
+
+# Document head and stylesheet for the HTML report; only the table widths are substituted (%-style)
+HTML_HEAD_TEMPLATE = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Policy Optimizer Tickets Report</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
             background: #f5f5f5;
             color: #333;
-            min-width: {min_width + 40}px;
-        }}
+            min-width: %(page_min_width)dpx;
+        }
         
-        .header-section {{
+        .header-section {
             width: 100vw;
             max-width: 100vw;
             background: #f5f5f5;
             padding: 20px;
             border-bottom: 1px solid #ddd;
             overflow: hidden;
-        }}
+        }
         
-        h1 {{
+        h1 {
             font-size: 24px;
             font-weight: 600;
             margin-bottom: 10px;
             color: #2c3e50;
-        }}
+        }
         
-        .subtitle {{
+        .subtitle {
             color: #7f8c8d;
             margin-bottom: 20px;
             font-size: 14px;
-        }}
+        }
         
-        .summary {{
+        .summary {
             margin-bottom: 20px;
             padding: 20px;
-            background: linear-gradient(135deg, #0071bc 0%, #062c4c 100%);
+            background: linear-gradient(135deg, #0071bc 0%%, #062c4c 100%%);
             border-radius: 8px;
             color: white;
             max-width: 1200px;
-        }}
+        }
         
-        .summary-title {{
+        .summary-title {
             font-size: 18px;
             font-weight: 600;
             margin-bottom: 15px;
             opacity: 0.95;
-        }}
+        }
         
-        .summary-items {{
+        .summary-items {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
             gap: 20px;
-        }}
+        }
         
-        .summary-item {{
+        .summary-item {
             text-align: center;
             padding: 10px;
             background: rgba(255, 255, 255, 0.15);
@@ -700,73 +985,73 @@ def generate_html_report(api_url, token, tickets, output_html, include_rule_deta
             backdrop-filter: blur(10px);
             cursor: pointer;
             transition: all 0.3s ease;
-        }}
+        }
         
-        .summary-item:hover {{
+        .summary-item:hover {
             background: rgba(255, 255, 255, 0.25);
             transform: translateY(-2px);
             box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
-        }}
+        }
         
-        .summary-item.active {{
+        .summary-item.active {
             background: rgba(255, 255, 255, 0.3);
             box-shadow: 0 0 0 2px rgba(255, 255, 255, 0.5);
-        }}
+        }
         
-        .summary-label {{
+        .summary-label {
             font-size: 12px;
             opacity: 0.9;
             margin-bottom: 5px;
             text-transform: uppercase;
             letter-spacing: 0.5px;
-        }}
+        }
         
-        .summary-value {{
+        .summary-value {
             font-size: 32px;
             font-weight: bold;
-        }}
+        }
         
-        .filters {{
+        .filters {
             background: #ecf0f1;
             padding: 15px;
             border-radius: 4px;
             max-width: 1200px;
-        }}
+        }
         
-        .filters input, .filters select {{
+        .filters input, .filters select {
             padding: 5px 10px;
             margin: 0 5px;
             border: 1px solid #bdc3c7;
             border-radius: 4px;
-        }}
+        }
         
-        .table-section {{
-            width: 100%;
+        .table-section {
+            width: 100%%;
             padding: 20px;
             background: #f5f5f5;
-        }}
+        }
         
-        table {{
+        table {
             border-collapse: collapse;
-            width: 100%;
-            min-width: {min_width}px;
+            width: 100%%;
+            min-width: %(table_min_width)dpx;
             background: white;
-        }}
+        }
         
-        th, td {{
+        th, td {
             border: 1px solid #ddd;
             padding: 8px;
             text-align: left;
             white-space: nowrap;
-        }}
+        }
         
-        thead {{
+        thead {
             position: sticky;
             top: 0;
             z-index: 10;
-        }}
+        }
         
-        th {{
+        th {
             background: #34495e;
             color: white;
             font-weight: 600;
@@ -776,208 +1061,102 @@ def generate_html_report(api_url, token, tickets, output_html, include_rule_deta
             z-index: 10;
             cursor: pointer;
             user-select: none;
-        }}
+        }
         
-        th:hover {{
+        th:hover {
             background: #2c3e50;
-        }}
+        }
         
-        th.sorted-asc::after {{
+        th.sorted-asc::after {
             content: ' ▲';
             font-size: 10px;
-        }}
+        }
         
-        th.sorted-desc::after {{
+        th.sorted-desc::after {
             content: ' ▼';
             font-size: 10px;
-        }}
+        }
         
-        tr:nth-child(even) {{
+        tr:nth-child(even) {
             background-color: #f9f9f9;
-        }}
+        }
         
-        tr:hover {{
+        tr:hover {
             background-color: #e8f4f8;
-        }}
+        }
         
-        a {{
+        a {
             color: #3498db;
             text-decoration: none;
-        }}
+        }
         
-        a:hover {{
+        a:hover {
             text-decoration: underline;
-        }}
+        }
         
-        .status {{
+        .status {
             padding: 3px 8px;
             border-radius: 3px;
             font-size: 11px;
             font-weight: 600;
             display: inline-block;
-        }}
+        }
         
-        .status-review {{
+        .status-review {
             background: #f39c12;
             color: white;
-        }}
+        }
         
-        .status-completed {{
+        .status-completed {
             background: #27ae60;
             color: white;
-        }}
+        }
         
-        .status-cancelled {{
+        .status-cancelled {
             background: #95a5a6;
             color: white;
-        }}
+        }
         
-        td.text-wrap {{
+        td.text-wrap {
             white-space: normal;
             max-width: 300px;
-        }}
+        }
         
-        .prop-header {{
+        .prop-header {
             background: #2c3e50;
             border-left: 2px solid #1a252f;
-        }}
+        }
         
-        .detail-header {{
+        .detail-header {
             background: #2c4e5c;
-        }}
+        }
         
-        @media screen and (max-width: 1200px) {{
-            .header-section {{
+        @media screen and (max-width: 1200px) {
+            .header-section {
                 padding: 15px;
-            }}
-            .summary {{
-                max-width: 100%;
-            }}
-            .filters {{
-                max-width: 100%;
-            }}
-        }}
-        
-        @media print {{
-            th {{
+            }
+            .summary {
+                max-width: 100%%;
+            }
+            .filters {
+                max-width: 100%%;
+            }
+        }
+        
+        @media print {
+            th {
                 position: static;
-            }}
-            thead {{
+            }
+            thead {
                 position: static;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
-<body>
-    <div class="header-section">
-        <h1>Policy Optimizer Tickets Report</h1>
-        <div class="subtitle">Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</div>
-        
-        <div class="summary">
-            <div class="summary-title">Report Summary</div>
-            <div class="summary-items">
-                <div class="summary-item" onclick="filterByStatus('')" title="Click to show all tickets">
-                    <div class="summary-label">Total Tickets</div>
-                    <div class="summary-value">{total_count}</div>
-                </div>
-                <div class="summary-item" onclick="filterByStatus('Review')" title="Click to filter by Review status">
-                    <div class="summary-label">In Review</div>
-                    <div class="summary-value">{review_count}</div>
-                </div>
-                <div class="summary-item" onclick="filterByStatus('Completed')" title="Click to filter by Completed status">
-                    <div class="summary-label">Completed</div>
-                    <div class="summary-value">{completed_count}</div>
-                </div>
-                <div class="summary-item" onclick="filterByStatus('Cancelled')" title="Click to filter by Cancelled status">
-                    <div class="summary-label">Cancelled</div>
-                    <div class="summary-value">{cancelled_count}</div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="filters">
-            <label>Filter:</label>
-            <input type="text" id="searchInput" placeholder="Search..." onkeyup="filterTable()">
-            <select id="statusFilter" onchange="filterTable()">
-                <option value="">All Status</option>
-                <option value="Review">Review</option>
-                <option value="Completed">Completed</option>
-                <option value="Cancelled">Cancelled</option>
-            </select>
-        </div>
-    </div>
-    
-    <div class="table-section">
-        <table id="ticketsTable">
-            <thead>
-                <tr>
-                    <th onclick="sortTable(0)">Ticket ID</th>
-                    <th onclick="sortTable(1)">Created Date</th>
-                    <th onclick="sortTable(2)">Created By</th>
-                    <th onclick="sortTable(3)">Processed Date</th>
-                    <th onclick="sortTable(4)">Assignee/Completed By</th>
-                    <th onclick="sortTable(5)">Status</th>
-                    <th onclick="sortTable(6)">Device Name</th>
-                    <th onclick="sortTable(7)">Policy Name</th>
-                    <th onclick="sortTable(8)">Rule #</th>
-                    <th onclick="sortTable(9)">Rule Name</th>"""
-    col_index = 10
-    if include_rule_details:
-        for field in rule_detail_fields:
-            html_content += f"""
-                        <th class="detail-header" onclick="sortTable({col_index})">{field.title()}</th>"""
-            col_index += 1
-    
-    if include_rule_docs and sorted_prop_fields:
-        for field in sorted_prop_fields:
-            header_name = field.replace('_', ' ').title()
-            html_content += f"""
-                        <th class="prop-header" onclick="sortTable({col_index})" title="Rule Doc: {field}">{header_name}</th>"""
-            col_index += 1
-    
-    html_content += """
-                    </tr>
-                </thead>
-                <tbody>
-    """
-    
-    # Add ticket rows
-    for ticket in tickets_data:
-        status_class = f"status-{ticket['status'].lower()}"
-        
-        html_content = html_content + f"""
-                <tr>
-                    <td><a href="{ticket['ticket_url']}" target="_blank">{ticket['business_key']}</a></td>
-                    <td>{ticket['created_date']}</td>
-                    <td>{ticket['created_by']}</td>
-                    <td>{ticket['completed_date']}</td>
-                    <td>{ticket['assignee_completed']}</td>
-                    <td><span class="status {status_class}">{ticket['status']}</span></td>
-                    <td><a href="{ticket['device_url']}" target="_blank">{ticket['device_name']}</a></td>
-                    <td class="text-wrap">{ticket['policy_name']}</td>
-                    <td>{ticket['rule_number']}</td>
-                    <td class="text-wrap"><a href="{ticket['rule_url']}" target="_blank">{ticket['rule_name']}</a></td>"""
-        
-        if include_rule_details:
-            for field in rule_detail_fields:
-                value = ticket.get(field, 'N/A')
-                html_content = html_content + f"""
-                    <td class="text-wrap">{value}</td>"""
-        
-        if include_rule_docs:
-            props = ticket.get('props', {})
-            for field in sorted_prop_fields:
-                value = props.get(field, 'N/A')
-                if isinstance(value, str) and len(value) > 100:
-                    value = value[:100] + '...'
-                html_content = html_content + f"""
-                    <td class="text-wrap" title="{props.get(field, 'N/A')}">{value}</td>"""
-        
-        html_content = html_content + """
-                </tr>"""
-    
-    # Add closing HTML and JavaScript
-    html_content = html_content + """
+"""
+
+# Closing markup and page script for the HTML report
+HTML_FOOTER = """
                 </tbody>
             </table>
         </div>
@@ -986,6 +1165,33 @@ def generate_html_report(api_url, token, tickets, output_html, include_rule_deta
         var sortOrder = {};
         var currentStatusFilter = '';
         
+        // Body rows with their cell text, read from the DOM once so sorting and filtering work on arrays
+        var tableRows = null;
+        
+        function getTableRows() {
+            if (tableRows === null) {
+                var tbody = document.getElementById("ticketsTable").getElementsByTagName("tbody")[0];
+                tableRows = Array.from(tbody.rows, function(tr) {
+                    var cells = Array.from(tr.cells, function(td) { return td.textContent; });
+                    return {
+                        element: tr,
+                        cells: cells,
+                        // Uppercased text of all cells; the newline separator keeps matches within one cell
+                        search: cells.join('\\n').toUpperCase()
+                    };
+                });
+            }
+            return tableRows;
+        }
+        
+        // Run the search filter once typing pauses instead of on every keystroke
+        var filterTimer = null;
+        
+        function scheduleFilter() {
+            clearTimeout(filterTimer);
+            filterTimer = setTimeout(filterTable, 80);
+        }
+        
         function filterByStatus(status) {
             document.getElementById('statusFilter').value = status;
             
@@ -1009,9 +1215,9 @@ def generate_html_report(api_url, token, tickets, output_html, include_rule_deta
         }
         
         function sortTable(columnIndex) {
+            var rows = getTableRows();
             var table = document.getElementById("ticketsTable");
             var tbody = table.getElementsByTagName("tbody")[0];
-            var rows = Array.from(tbody.getElementsByTagName("tr"));
             var headers = table.getElementsByTagName("th");
             
             if (!sortOrder[columnIndex] || sortOrder[columnIndex] === 'desc') {
@@ -1026,82 +1232,62 @@ def generate_html_report(api_url, token, tickets, output_html, include_rule_deta
             
             headers[columnIndex].classList.add('sorted-' + sortOrder[columnIndex]);
             
-            rows.sort(function(a, b) {
-                var aValue = a.getElementsByTagName("td")[columnIndex].textContent || a.getElementsByTagName("td")[columnIndex].innerText;
-                var bValue = b.getElementsByTagName("td")[columnIndex].textContent || b.getElementsByTagName("td")[columnIndex].innerText;
-                
+            // Compute each row's sort key once, then sort on the keys alone
+            var keyed = rows.map(function(row) {
+                var value = row.cells[columnIndex];
                 if (columnIndex === 1 || columnIndex === 3) {
-                    aValue = aValue ? new Date(aValue).getTime() : 0;
-                    bValue = bValue ? new Date(bValue).getTime() : 0;
+                    value = value ? new Date(value).getTime() : 0;
                 }
                 else if (columnIndex === 8) {
-                    aValue = parseInt(aValue) || 0;
-                    bValue = parseInt(bValue) || 0;
+                    value = parseInt(value) || 0;
                 }
                 else {
-                    aValue = aValue.toLowerCase();
-                    bValue = bValue.toLowerCase();
-                }
-                
-                if (sortOrder[columnIndex] === 'asc') {
-                    if (aValue < bValue) return -1;
-                    if (aValue > bValue) return 1;
-                    return 0;
-                } else {
-                    if (aValue > bValue) return -1;
-                    if (aValue < bValue) return 1;
-                    return 0;
+                    value = value.toLowerCase();
                 }
+                return { key: value, row: row };
             });
             
-            tbody.innerHTML = "";
+            var direction = sortOrder[columnIndex] === 'asc' ? 1 : -1;
+            keyed.sort(function(a, b) {
+                if (a.key < b.key) return -direction;
+                if (a.key > b.key) return direction;
+                return 0;
+            });
+            for (var i = 0; i < keyed.length; i++) {
+                rows[i] = keyed[i].row;
+            }
+            
+            // Reinsert the sorted rows in one DOM operation
+            var fragment = document.createDocumentFragment();
             for (var i = 0; i < rows.length; i++) {
-                tbody.appendChild(rows[i]);
+                fragment.appendChild(rows[i].element);
             }
+            tbody.replaceChildren(fragment);
         }
         
         function filterTable() {
+            var rows = getTableRows();
             var input = document.getElementById("searchInput");
             var statusFilter = document.getElementById("statusFilter");
             var filter = input.value.toUpperCase();
             var statusValue = statusFilter.value.toUpperCase();
-            var table = document.getElementById("ticketsTable");
-            var tr = table.getElementsByTagName("tr");
             
             var visibleCount = 0;
             
-            for (var i = 1; i < tr.length; i++) {
-                var td = tr[i].getElementsByTagName("td");
-                var textMatch = false;
+            for (var i = 0; i < rows.length; i++) {
+                var cells = rows[i].cells;
+                var textMatch = !filter || rows[i].search.indexOf(filter) > -1;
                 var statusMatch = true;
                 
-                if (filter) {
-                    for (var j = 0; j < td.length; j++) {
-                        if (td[j]) {
-                            var txtValue = td[j].textContent || td[j].innerText;
-                            if (txtValue.toUpperCase().indexOf(filter) > -1) {
-                                textMatch = true;
-                                break;
-                            }
-                        }
-                    }
-                } else {
-                    textMatch = true;
-                }
-                
-                if (statusValue) {
-                    var statusTd = td[5];
-                    if (statusTd) {
-                        var statusText = statusTd.textContent || statusTd.innerText;
-                        statusMatch = statusText.toUpperCase() === statusValue;
-                    }
+                if (statusValue && cells.length > 5) {
+                    statusMatch = cells[5].toUpperCase() === statusValue;
                 }
                 
                 if (textMatch && statusMatch) {
-                    tr[i].style.display = "";
+                    rows[i].element.style.display = "";
                     visibleCount++;
                 } else {
-                    tr[i].style.display = "none";
+                    rows[i].element.style.display = "none";
                 }
             }
             
@@ -1162,53 +1348,234 @@ def generate_html_report(api_url, token, tickets, output_html, include_rule_deta
     </script>
 </body>
 </html>"""
+HTML_FOOTER_BYTES = HTML_FOOTER.encode('utf-8')
+
+# Render the HTML table body for the report
+def render_html_rows(rows, include_rule_details=False, include_rule_docs=False,
+                     rule_detail_fields=None, sorted_prop_fields=None):
+    """Yield the <tbody> markup one ticket row at a time."""
+    # Build the row template and its field getter once; rule detail cells become extra placeholders
+    row_template = HTML_ROW_TEMPLATE
+    row_fields = HTML_ROW_FIELDS
+    if include_rule_details:
+        row_template += HTML_DETAIL_CELL_TEMPLATE * len(rule_detail_fields)
+        row_fields += tuple(rule_detail_fields)
+    if not include_rule_docs:
+        row_template += HTML_ROW_END
+    get_row_values = itemgetter(*row_fields)
+    
+    for ticket in rows:
+        row_parts = []
+        status = ticket['status']
+        ticket['status_class'] = STATUS_CLASS.get(status) or f"status-{status.lower()}"
+        
+        # Pull the cell values out in one call and escape the text ones before substituting them
+        values = tuple(html.escape(value) if isinstance(value, str) else value for value in get_row_values(ticket))
+        row_parts.append(row_template % values)
+        
+        if include_rule_docs:
+            # Missing rule doc values show as N/A
+            get_prop = (ticket.get('props') or {}).get
+            for field in sorted_prop_fields:
+                value = get_prop(field, 'N/A')
+                text = value if isinstance(value, str) else str(value)
+                full = html.escape(text)
+                # Truncate the raw text so an escaped entity is never cut in half
+                shown = full if len(text) <= 100 else html.escape(text[:100]) + '...'
+                row_parts.append(f"""
+                    <td class="text-wrap" title="{full}">{shown}</td>""")
+            row_parts.append(HTML_ROW_END)
+        
+        yield ''.join(row_parts)
+
+# Generate HTML report from report rows with field selection
+def generate_html_report(rows, output_html, status_counts, include_rule_details=False, include_rule_docs=False,
+                        rule_detail_fields=None, sorted_prop_fields=None, prop_headers=None, compress=False,
+                        generated_at=None):
+    """Write the HTML report and return (row_count, bytes_written, summary_lines).
+
+    The summary lines are returned rather than printed because the report writers run concurrently.
+    """
+    rule_detail_fields = resolve_rule_detail_fields(rule_detail_fields)
+    sorted_prop_fields = sorted_prop_fields or []
+    # Callers pass the run's report time so the page matches the filename and email
+    generated_at = generated_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    
+    # Summary statistics come from the caller since rows are consumed while writing
+    review_count = status_counts.get('Review', 0)
+    completed_count = status_counts.get('Completed', 0)
+    cancelled_count = status_counts.get('Cancelled', 0)
+    total_count = sum(status_counts.values())
     
-    with open(output_html, 'w', encoding='utf-8') as file:
-        file.write(html_content)
+    # Calculate dynamic table width
+    base_columns = 10
+    extra_columns = len(rule_detail_fields) if include_rule_details else 0
+    prop_columns = len(sorted_prop_fields) if include_rule_docs else 0
+    total_columns = base_columns + extra_columns + prop_columns
+    min_width = max(1400, total_columns * 120)
+    
+    # Generate HTML content with page scrollbars and sticky table headers; header
+    # fragments are collected in a list and written out without concatenation
+    header_parts = [HTML_HEAD_TEMPLATE % {'page_min_width': min_width + 40, 'table_min_width': min_width}]
+    header_parts.append(f"""<body>
+    <div class="header-section">
+        <h1>Policy Optimizer Tickets Report</h1>
+        <div class="subtitle">Generated: {generated_at}</div>
+        
+        <div class="summary">
+            <div class="summary-title">Report Summary</div>
+            <div class="summary-items">
+                <div class="summary-item" onclick="filterByStatus('')" title="Click to show all tickets">
+                    <div class="summary-label">Total Tickets</div>
+                    <div class="summary-value">{total_count}</div>
+                </div>
+                <div class="summary-item" onclick="filterByStatus('Review')" title="Click to filter by Review status">
+                    <div class="summary-label">In Review</div>
+                    <div class="summary-value">{review_count}</div>
+                </div>
+                <div class="summary-item" onclick="filterByStatus('Completed')" title="Click to filter by Completed status">
+                    <div class="summary-label">Completed</div>
+                    <div class="summary-value">{completed_count}</div>
+                </div>
+                <div class="summary-item" onclick="filterByStatus('Cancelled')" title="Click to filter by Cancelled status">
+                    <div class="summary-label">Cancelled</div>
+                    <div class="summary-value">{cancelled_count}</div>
+                </div>
+            </div>
+        </div>
+        
+        <div class="filters">
+            <label>Filter:</label>
+            <input type="text" id="searchInput" placeholder="Search..." oninput="scheduleFilter()">
+            <select id="statusFilter" onchange="filterTable()">
+                <option value="">All Status</option>
+                <option value="Review">Review</option>
+                <option value="Completed">Completed</option>
+                <option value="Cancelled">Cancelled</option>
+            </select>
+        </div>
+    </div>
     
-    print(f"✅ Generated HTML report with {len(tickets_data)} tickets")
+    <div class="table-section">
+        <table id="ticketsTable">
+            <thead>
+                <tr>
+                    <th onclick="sortTable(0)">Ticket ID</th>
+                    <th onclick="sortTable(1)">Created Date</th>
+                    <th onclick="sortTable(2)">Created By</th>
+                    <th onclick="sortTable(3)">Processed Date</th>
+                    <th onclick="sortTable(4)">Assignee/Completed By</th>
+                    <th onclick="sortTable(5)">Status</th>
+                    <th onclick="sortTable(6)">Device Name</th>
+                    <th onclick="sortTable(7)">Policy Name</th>
+                    <th onclick="sortTable(8)">Rule #</th>
+                    <th onclick="sortTable(9)">Rule Name</th>""")
+    col_index = 10
     if include_rule_details:
-        print(f"   📋 Included rule detail fields: {', '.join(rule_detail_fields)}")
+        for field in rule_detail_fields:
+            header_parts.append(f"""
+                        <th class="detail-header" onclick="sortTable({col_index})">{html.escape(_pretty_field_name(field))}</th>""")
+            col_index += 1
+    
     if include_rule_docs and sorted_prop_fields:
-        print(f"   📋 Included {len(sorted_prop_fields)} rule doc fields: {', '.join(sorted_prop_fields)}")
-    logging.info(f"HTML report generated: {output_html}")
+        if prop_headers is None:
+            prop_headers = rule_doc_header_names(sorted_prop_fields)
+        # Rule doc field names are props keys from the API, so escape them like the cell values
+        for field, header_name in zip(sorted_prop_fields, prop_headers):
+            header_parts.append(f"""
+                        <th class="prop-header" onclick="sortTable({col_index})" title="Rule Doc: {html.escape(field)}">{html.escape(header_name)}</th>""")
+            col_index += 1
+    
+    header_parts.append("""
+                    </tr>
+                </thead>
+                <tbody>
+    """)
     
-    # Return discovered fields for config generation
-    return len(tickets_data), sorted(list(all_prop_fields))
+    # Stream the document to disk in row batches instead of building it in memory; the file
+    # is binary so each batch is encoded once and the static footer is already bytes. The
+    # gzip stream wraps the same 1 MiB buffered file so compressed output is also written in large blocks
+    with open(output_html, 'wb', buffering=1 << 20) as raw_file:
+        file = gzip.GzipFile(fileobj=raw_file, mode='wb', compresslevel=6) if compress else raw_file
+        file.write(''.join(header_parts).encode('utf-8'))
+        
+        # Write rendered rows in batches so each write covers many rows
+        row_count = 0
+        batch = []
+        for row_html in render_html_rows(rows, include_rule_details, include_rule_docs,
+                                         rule_detail_fields, sorted_prop_fields):
+            batch.append(row_html)
+            row_count += 1
+            if len(batch) >= HTML_WRITE_BATCH_ROWS:
+                file.write(''.join(batch).encode('utf-8'))
+                batch = []
+        file.write(''.join(batch).encode('utf-8'))
+        
+        file.write(HTML_FOOTER_BYTES)
+        if compress:
+            # Closing the gzip stream writes its trailer but leaves the underlying file open
+            file.close()
+        bytes_written = raw_file.tell()
+    
+    summary_lines = [f"✅ Generated HTML report with {row_count} tickets"]
+    summary_lines += included_fields_summary(include_rule_details, include_rule_docs, rule_detail_fields, sorted_prop_fields)
+    return row_count, bytes_written, summary_lines
+
+# Open an SMTP connection, negotiating TLS and logging in as needed
+def open_smtp_connection(smtp_server, smtp_port, smtp_user, smtp_password):
+    """Return a connected (and authenticated, when credentials are given) SMTP client."""
+    if smtp_port == 587:
+        server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
+        server.ehlo()
+        server.starttls()
+        server.ehlo()
+    elif smtp_port == 465:
+        server = smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=30)
+    else:
+        server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
+    
+    if smtp_user and smtp_password:
+        server.login(smtp_user, smtp_password)
+    return server
 
 # Enhanced email sending function
-def send_email_report(smtp_server, smtp_port, smtp_user, smtp_password, recipients, subject, body, attachments):
+def send_email_report(smtp_server, smtp_port, smtp_user, smtp_password, recipients, subject, body, attachments,
+                      smtp_connection=None):
+    """Email the reports; smtp_connection may be a future for a connection opened in the background."""
     print(f"\n📧 Sending email report...")
     
+    # Build the message once; each attachment is read from disk a single time
+    msg = EmailMessage()
+    msg['To'] = ', '.join(recipients)
+    msg['Subject'] = subject
+    msg.set_content(body)
+    for file_path in attachments:
+        if os.path.exists(file_path):
+            # Read straight into a preallocated buffer and hand over a view of it, avoiding extra copies
+            data = bytearray(os.path.getsize(file_path))
+            with open(file_path, 'rb') as file:
+                size = file.readinto(data)
+            # Compressed reports are labelled as gzip so mail clients offer to decompress them
+            subtype = 'gzip' if file_path.endswith('.gz') else 'octet-stream'
+            msg.add_attachment(memoryview(data)[:size], maintype='application', subtype=subtype,
+                               filename=os.path.basename(file_path))
+    
     # If using local mail system
     if not smtp_server:
         print("   Using local mail system (sendmail/postfix)")
+        msg['From'] = f"firemon@{os.uname().nodename}"
         try:
-            for recipient in recipients:
-                msg = MIMEMultipart()
-                msg['From'] = f"firemon@{os.uname().nodename}"
-                msg['To'] = recipient
-                msg['Subject'] = subject
-                msg.attach(MIMEText(body, 'plain'))
-                
-                for file_path in attachments:
-                    if os.path.exists(file_path):
-                        with open(file_path, 'rb') as file:
-                            part = MIMEBase('application', 'octet-stream')
-                            part.set_payload(file.read())
-                            encoders.encode_base64(part)
-                            part.add_header('Content-Disposition', f'attachment; filename={os.path.basename(file_path)}')
-                            msg.attach(part)
-                
-                sendmail = subprocess.Popen(["/usr/sbin/sendmail", recipient], stdin=subprocess.PIPE)
-                sendmail.communicate(msg.as_string().encode())
-                
-                if sendmail.returncode == 0:
-                    print(f"   ✅ Email sent to {recipient}")
-                else:
-                    print(f"   ❌ Failed to send to {recipient}")
-                    
-            return True
+            # One sendmail process delivers to every recipient listed in the To header; -odb
+            # queues the message for background delivery instead of waiting on each recipient
+            sendmail = subprocess.Popen(["/usr/sbin/sendmail", "-t", "-oi", "-odb"], stdin=subprocess.PIPE)
+            sendmail.communicate(msg.as_bytes())
+            
+            if sendmail.returncode == 0:
+                print(f"   ✅ Email sent to {', '.join(recipients)}")
+                return True
+            print(f"   ❌ Failed to send to {', '.join(recipients)}")
+            logging.error(f"sendmail exited with status {sendmail.returncode}")
+            return False
             
         except Exception as e:
             print(f"   ❌ Local mail sending failed: {e}")
@@ -1216,41 +1583,33 @@ def send_email_report(smtp_server, smtp_port, smtp_user, smtp_password, recipien
             return False
     
     # Using SMTP server
-    msg = MIMEMultipart()
-    msg['From'] = smtp_user
-    msg['To'] = ', '.join(recipients)
-    msg['Subject'] = subject
-    
-    msg.attach(MIMEText(body, 'plain'))
-    
-    for file_path in attachments:
-        if os.path.exists(file_path):
-            with open(file_path, 'rb') as file:
-                part = MIMEBase('application', 'octet-stream')
-                part.set_payload(file.read())
-                encoders.encode_base64(part)
-                part.add_header('Content-Disposition', f'attachment; filename={os.path.basename(file_path)}')
-                msg.attach(part)
+    msg['From'] = smtp_user or ''
     
     try:
         print(f"   Connecting to {smtp_server}:{smtp_port}")
-        
-        if smtp_port == 587:
-            server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
-            server.ehlo()
-            server.starttls()
-            server.ehlo()
-        elif smtp_port == 465:
-            server = smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=30)
-        else:
-            server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
-        
         if smtp_user and smtp_password:
             print(f"   Authenticating as {smtp_user}")
-            server.login(smtp_user, smtp_password)
+        
+        # Reuse the connection opened during report generation if it is still alive. A failed
+        # background connect or login is raised as is: retrying it would repeat a failed login,
+        # which can trip account lockout policies. Only an established connection that has since
+        # dropped is reopened
+        server = None
+        if smtp_connection is not None:
+            server = smtp_connection.result()
+            try:
+                if server.noop()[0] != 250:
+                    server.close()
+                    server = None
+            except (smtplib.SMTPException, OSError) as e:
+                logging.debug(f"Background SMTP connection dropped, reconnecting: {e}")
+                server.close()
+                server = None
+        if server is None:
+            server = open_smtp_connection(smtp_server, smtp_port, smtp_user, smtp_password)
         
         print(f"   Sending message...")
-        server.send_message(msg)
+        server.send_message(msg, to_addrs=recipients)
         server.quit()
         print(f"✅ Email sent successfully to {', '.join(recipients)}")
         return True
@@ -1279,13 +1638,110 @@ def save_generated_config(filename, config_data):
         print(f"⚠️ Error saving configuration: {e}")
         return False
 
+# Exit immediately on an uncaught Ctrl-C
+def exit_on_interrupt(exc_type, exc_value, exc_traceback):
+    """sys.excepthook that ends the process at once for KeyboardInterrupt and defers to the default hook otherwise."""
+    if not issubclass(exc_type, KeyboardInterrupt):
+        sys.__excepthook__(exc_type, exc_value, exc_traceback)
+        return
+    # Executor worker threads are joined at interpreter exit, so a normal exit would first run every
+    # queued ticket page and rule detail batch; os._exit stops them, so flush what atexit would have
+    print("\n\n⚠️ Interrupted by user")
+    logging.warning("Run interrupted by user")
+    save_prompt_answers()
+    logging.shutdown()
+    sys.stdout.flush()
+    os._exit(130)
+
+# Load prompt answers saved by earlier interactive runs
+def load_prompt_answers():
+    """Load saved prompt answers and write them back when the script exits."""
+    try:
+        with open(PROMPT_CACHE_FILE, 'r', encoding='utf-8') as f:
+            _prompt_answers.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, TypeError) as e:
+        logging.warning(f"Ignoring unreadable prompt answers {PROMPT_CACHE_FILE}: {e}")
+    atexit.register(save_prompt_answers)
+
+# Persist prompt answers for later runs
+def save_prompt_answers():
+    """Save prompt answers if any changed during this run."""
+    if not _prompt_answers_changed:
+        return
+    try:
+        write_json_atomic(PROMPT_CACHE_FILE, _prompt_answers, indent=2)
+    except OSError as e:
+        logging.warning(f"Could not save prompt answers {PROMPT_CACHE_FILE}: {e}")
+
+# Delete prompt answers saved by earlier runs
+def clear_prompt_answers():
+    """Remove the saved prompt answers file so this run prompts without defaults."""
+    try:
+        PROMPT_CACHE_FILE.unlink()
+        print(f"🧹 Cleared saved prompt answers: {PROMPT_CACHE_FILE}")
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning(f"Could not remove prompt answers {PROMPT_CACHE_FILE}: {e}")
+
+# Prompt for input, offering the answer saved by a previous run as the default
+def cached_input(key, prompt, validator=None, default=None):
+    """Return the stripped answer, or the saved (else given) default when left blank; valid answers are saved."""
+    global _prompt_answers_changed
+    default = _prompt_answers.get(key, default)
+    if default:
+        answer = input(f"{prompt} [{default}]: ").strip() or default
+    else:
+        answer = input(f"{prompt}: ").strip()
+    if answer and answer != _prompt_answers.get(key) and (validator is None or validator(answer)):
+        _prompt_answers[key] = answer
+        _prompt_answers_changed = True
+    return answer
+
+# Ask a yes/no question until it is answered, remembering the answer like cached_input
+def cached_yes_no(key, prompt):
+    """Return True for a yes answer and False for a no answer."""
+    while True:
+        choice = cached_input(key, prompt, lambda a: a.lower() in ('y', 'yes', 'n', 'no')).lower()
+        if choice in ['y', 'yes']:
+            return True
+        elif choice in ['n', 'no']:
+            return False
+        else:
+            print("   ❌ Please enter 'y' for yes or 'n' for no")
+
+# Ask for a whole number between lo and hi (inclusive) until one is entered, remembering it like cached_input
+def prompt_int(key, prompt, error, lo=1, hi=None):
+    """Return the entered number, printing the error message after each invalid answer."""
+    def parse(answer):
+        try:
+            value = int(answer)
+        except ValueError:
+            return None
+        if value < lo or (hi is not None and value > hi):
+            return None
+        return value
+    
+    while True:
+        value = parse(cached_input(key, prompt, lambda answer: parse(answer) is not None))
+        if value is not None:
+            return value
+        print(error)
+
 if __name__ == "__main__":
+    # End the run at once on Ctrl-C rather than after queued background requests finish
+    sys.excepthook = exit_on_interrupt
+    
     # Parse command-line arguments
     parser = argparse.ArgumentParser(description="FireMon Policy Optimizer Tickets Report Generator")
     parser.add_argument('--config', help="Path to configuration JSON file")
     parser.add_argument('--generate-sample-config', action='store_true', 
                        help="Generate a sample configuration file and exit")
     parser.add_argument('--generate-config', help="Save the configuration used in this run to specified file")
+    parser.add_argument('--clear-memo', action='store_true',
+                       help="Forget saved answers to interactive prompts before prompting")
     parser.add_argument('--host', help="FireMon host (e.g., https://demo.firemon.xyz)")
     parser.add_argument('--username', help="FireMon username")
     parser.add_argument('--password', help="FireMon password")
@@ -1295,15 +1751,18 @@ if __name__ == "__main__":
     parser.add_argument('--days', type=int, help="Only include tickets from the last X days")
     parser.add_argument('--csv', action='store_true', help="Generate CSV report")
     parser.add_argument('--html', action='store_true', help="Generate HTML report")
+    parser.add_argument('--html-gzip', action='store_true', help="Write the HTML report gzip-compressed (.html.gz)")
     parser.add_argument('--include-rule-details', action='store_true', 
                        help="Include detailed rule information")
     parser.add_argument('--include-rule-docs', action='store_true',
                        help="Include rule documentation fields")
     parser.add_argument('--rule-detail-fields', nargs='+', 
-                       choices=['source', 'destination', 'service', 'application', 'action'],
+                       choices=AVAILABLE_RULE_DETAIL_FIELDS,
                        help="Specific rule detail fields to include (default: all)")
     parser.add_argument('--rule-doc-fields', nargs='+',
                        help="Specific rule documentation fields to include (default: all available)")
+    parser.add_argument('--no-cache', action='store_true',
+                       help="Do not read or write the on-disk rule details cache")
     parser.add_argument('--email', action='store_true', help="Send report via email")
     parser.add_argument('--email-recipients', nargs='+', help="Email recipients")
     parser.add_argument('--smtp-server', help="SMTP server address")
@@ -1326,6 +1785,11 @@ if __name__ == "__main__":
     # Load configuration file if provided
     config = load_config(args.config) if args.config else {}
     
+    # Offer answers from earlier interactive runs as prompt defaults
+    if args.clear_memo:
+        clear_prompt_answers()
+    load_prompt_answers()
+    
     # Merge configuration with command-line arguments (CLI takes precedence)
     api_host = args.host or config.get('host')
     username = args.username or config.get('username')
@@ -1335,10 +1799,15 @@ if __name__ == "__main__":
     days_filter = args.days or config.get('days')
     generate_csv = args.csv or config.get('csv', False)
     generate_html = args.html or config.get('html', False)
+    html_gzip = args.html_gzip or config.get('html_gzip', False)
     include_rule_details = args.include_rule_details or config.get('include_rule_details', False)
     include_rule_docs = args.include_rule_docs or config.get('include_rule_docs', False)
     rule_detail_fields = args.rule_detail_fields or config.get('rule_detail_fields')
     rule_doc_fields = args.rule_doc_fields or config.get('rule_doc_fields')
+    rule_detail_concurrency = config.get('rule_detail_concurrency', DEFAULT_RULE_DETAIL_CONCURRENCY)
+    rule_cache_ttl = config.get('rule_cache_ttl', DEFAULT_RULE_CACHE_TTL)
+    rule_cache_closed_ttl = config.get('rule_cache_closed_ttl', DEFAULT_RULE_CACHE_CLOSED_TTL)
+    use_rule_cache = not args.no_cache
     
     # Email configuration
     email_config = config.get('email', {})
@@ -1365,13 +1834,13 @@ if __name__ == "__main__":
     api_url = api_host.rstrip('/') + '/securitymanager/api'
     
     # Authenticate
-    token = authenticate(api_url, username, password)
+    authenticate(api_url, username, password)
     logging.info("Authentication successful.")
     
     # Get workflow ID if not specified
     if not workflow_id:
         print("\n🔍 Fetching available workflows...")
-        workflows = get_workflows(api_url, token)
+        workflows = get_workflows(api_url)
         
         if workflows:
             if len(workflows) == 1:
@@ -1387,6 +1856,9 @@ if __name__ == "__main__":
                     status = " (DISABLED)" if disabled else ""
                     print(f"   {idx}. {wf_name} (ID: {wf_id}){status}")
                 
+                # Look up workflows entered by ID without rescanning the list
+                workflows_by_id = {wf.get('id'): wf for wf in workflows}
+                
                 while True:
                     selection = input("\nSelect workflow (enter number or workflow ID): ").strip()
                     
@@ -1398,9 +1870,9 @@ if __name__ == "__main__":
                             print(f"✅ Selected: {workflows[sel_num - 1]['name']} (ID: {workflow_id})")
                             break
                         # Check if it's a direct workflow ID
-                        elif any(wf['id'] == sel_num for wf in workflows):
+                        selected_wf = workflows_by_id.get(sel_num)
+                        if selected_wf is not None:
                             workflow_id = sel_num
-                            selected_wf = next(wf for wf in workflows if wf['id'] == sel_num)
                             print(f"✅ Selected: {selected_wf['name']} (ID: {workflow_id})")
                             break
                         else:
@@ -1419,7 +1891,8 @@ if __name__ == "__main__":
         print("2. HTML")
         print("3. Both CSV and HTML")
         while True:
-            report_selection = input("Enter option (1/2/3): ").strip()
+            report_selection = cached_input('report_type', "Enter option (1/2/3)",
+                                            lambda a: a in ('1', '2', '3'))
             if report_selection == '1':
                 generate_csv = True
                 break
@@ -1437,32 +1910,14 @@ if __name__ == "__main__":
     if not include_rule_details and not config.get('include_rule_details'):
         print("\n📋 Include detailed rule information?")
         print("   This includes: source, destination, service, application, action")
-        while True:
-            details_choice = input("   Include rule configuration details? (y/n): ").strip().lower()
-            if details_choice in ['y', 'yes']:
-                include_rule_details = True
-                break
-            elif details_choice in ['n', 'no']:
-                include_rule_details = False
-                break
-            else:
-                print("   ❌ Please enter 'y' for yes or 'n' for no")
+        include_rule_details = cached_yes_no('include_rule_details', "   Include rule configuration details? (y/n)")
     
     # Include rule documentation fields option if not specified
     if not include_rule_docs and not config.get('include_rule_docs'):
         print("\n📚 Include rule documentation fields?")
         print("   This includes custom fields like: owner, approver, change control #, etc.")
         print("   Note: This requires fetching rule details and may take longer")
-        while True:
-            docs_choice = input("   Include rule documentation fields? (y/n): ").strip().lower()
-            if docs_choice in ['y', 'yes']:
-                include_rule_docs = True
-                break
-            elif docs_choice in ['n', 'no']:
-                include_rule_docs = False
-                break
-            else:
-                print("   ❌ Please enter 'y' for yes or 'n' for no")
+        include_rule_docs = cached_yes_no('include_rule_docs', "   Include rule documentation fields? (y/n)")
     
     # Get filter options if not specified
     if not status_filter and not days_filter:
@@ -1472,7 +1927,8 @@ if __name__ == "__main__":
         print("3. Filter by date range")
         print("4. Filter by both status and date")
         while True:
-            filter_selection = input("Enter option (1/2/3/4): ").strip()
+            filter_selection = cached_input('filter', "Enter option (1/2/3/4)",
+                                            lambda a: a in ('1', '2', '3', '4'))
             if filter_selection in ['1', '2', '3', '4']:
                 break
             else:
@@ -1485,7 +1941,8 @@ if __name__ == "__main__":
             print("3. Completed")
             print("4. Cancelled")
             while True:
-                status_selection = input("Enter option (1/2/3/4): ").strip()
+                status_selection = cached_input('status', "Enter option (1/2/3/4)",
+                                                lambda a: a in ('1', '2', '3', '4'))
                 if status_selection in ['1', '2', '3', '4']:
                     status_map = {'1': 'all', '2': 'Review', '3': 'Completed', '4': 'Cancelled'}
                     status_filter = status_map[status_selection]
@@ -1494,42 +1951,39 @@ if __name__ == "__main__":
                     print("❌ Invalid selection. Please enter 1, 2, 3, or 4.")
         
         if filter_selection in ['3', '4']:
-            while True:
-                days_input = input("\nEnter number of days to look back (e.g., 30): ").strip()
-                if days_input.isdigit() and int(days_input) > 0:
-                    days_filter = int(days_input)
-                    break
-                else:
-                    print("❌ Please enter a valid positive number.")
+            days_filter = prompt_int('days', "\nEnter number of days to look back (e.g., 30)",
+                                     "❌ Please enter a valid positive number.")
     
     # Set default status filter if not specified
     if not status_filter:
         status_filter = 'all'
     
+    # Start fetching tickets in the background so the download overlaps the email prompts; its
+    # console output is held back until the fetch is collected so it never lands inside a prompt
+    fetch_messages = []
+    ticket_executor = ThreadPoolExecutor(max_workers=1)
+    tickets_future = ticket_executor.submit(get_po_tickets, api_url, workflow_id, status_filter, days_filter,
+                                            fetch_messages.append)
+    ticket_executor.shutdown(wait=False)
+    
     # Email configuration if not specified
     if not send_email and not email_config.get('enabled'):
-        while True:
-            email_choice = input("\n📧 Send report via email? (y/n): ").strip().lower()
-            if email_choice in ['y', 'yes']:
-                send_email = True
-                break
-            elif email_choice in ['n', 'no']:
-                send_email = False
-                break
-            else:
-                print("   ❌ Please enter 'y' for yes or 'n' for no")
+        check_ticket_fetch(tickets_future, fetch_messages)
+        send_email = cached_yes_no('send_email', "\n📧 Send report via email? (y/n)")
     
     if send_email:
         if not email_recipients:
+            check_ticket_fetch(tickets_future, fetch_messages)
             while True:
-                recipients_input = input("Enter email recipients (comma-separated): ").strip()
+                recipients_input = cached_input('email_recipients', "Enter email recipients (comma-separated)",
+                                                lambda a: all(_EMAIL_RE.match(r.strip()) for r in a.split(',')))
                 if recipients_input:
                     email_recipients = [r.strip() for r in recipients_input.split(',')]
                     # Validate email format (basic validation)
                     valid_emails = []
                     invalid_emails = []
                     for email in email_recipients:
-                        if '@' in email and '.' in email.split('@')[1]:
+                        if _EMAIL_RE.match(email):
                             valid_emails.append(email)
                         else:
                             invalid_emails.append(email)
@@ -1544,37 +1998,39 @@ if __name__ == "__main__":
                     print("❌ Please enter at least one email address.")
         
         if not smtp_server:
+            check_ticket_fetch(tickets_future, fetch_messages)
             print("\n📮 Email sending method:")
             print("1. Use local mail system (sendmail/postfix)")
             print("2. Use SMTP server")
             while True:
-                email_method = input("Enter option (1/2) [default: 1]: ").strip() or '1'
+                email_method = cached_input('email_method', "Enter option (1/2)",
+                                            lambda a: a in ('1', '2'), default='1')
                 if email_method in ['1', '2']:
                     break
                 else:
                     print("❌ Invalid selection. Please enter 1 or 2.")
             
             if email_method == '2':
+                check_ticket_fetch(tickets_future, fetch_messages)
                 while True:
-                    smtp_server = input("Enter SMTP server: ").strip()
+                    smtp_server = cached_input('smtp_server', "Enter SMTP server")
                     if smtp_server:
                         break
                     else:
                         print("❌ Please enter a valid SMTP server address.")
                 
                 if not smtp_port:
-                    while True:
-                        port_input = input("Enter SMTP port (587 for TLS, 465 for SSL, 25 for plain): ").strip()
-                        if port_input.isdigit() and 1 <= int(port_input) <= 65535:
-                            smtp_port = int(port_input)
-                            break
-                        else:
-                            print("❌ Please enter a valid port number (1-65535).")
+                    check_ticket_fetch(tickets_future, fetch_messages)
+                    smtp_port = prompt_int('smtp_port', "Enter SMTP port (587 for TLS, 465 for SSL, 25 for plain)",
+                                           "❌ Please enter a valid port number (1-65535).", hi=65535)
                 
                 if not smtp_user:
+                    check_ticket_fetch(tickets_future, fetch_messages)
+                    # Not remembered: a saved default would make a blank (no login) answer impossible
                     smtp_user = input("Enter SMTP username (leave blank if not required): ").strip()
                 
                 if smtp_user and not smtp_password:
+                    check_ticket_fetch(tickets_future, fetch_messages)
                     smtp_password = getpass.getpass("Enter SMTP password: ")
             else:
                 print("✔ Will use local mail system for sending")
@@ -1583,8 +2039,8 @@ if __name__ == "__main__":
                 smtp_user = None
                 smtp_password = None
     
-    # Fetch tickets
-    tickets = get_po_tickets(api_url, token, workflow_id, status_filter, days_filter)
+    # Wait for the ticket fetch started before the email prompts
+    tickets = finish_ticket_fetch(tickets_future, fetch_messages)
     
     if not tickets:
         print("\n⚠️ No tickets found with the specified filters.")
@@ -1592,62 +2048,93 @@ if __name__ == "__main__":
     
     # Create reports directory
     reports_dir = 'po_reports'
-    if not os.path.exists(reports_dir):
+    # Creating it directly avoids a separate existence check that could race with another run
+    try:
         os.makedirs(reports_dir)
         print(f"\n📁 Created reports directory: {reports_dir}")
+    except FileExistsError:
+        pass
     
-    # Generate timestamp for filenames
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    # Generate timestamp for filenames; the same report time is reused for the config metadata and email
+    report_time = datetime.now()
+    report_time_str = report_time.strftime('%Y-%m-%d %H:%M:%S')
+    timestamp = report_time.strftime('%Y%m%d_%H%M%S')
     
     # Build filename
-    filename_parts = ['po_tickets']
-    filename_parts.append(f'wf{workflow_id}')
-    if status_filter and status_filter != 'all':
-        filename_parts.append(status_filter.lower())
-    if days_filter:
-        filename_parts.append(f'{days_filter}days')
-    filename_parts.append(timestamp)
-    
-    base_filename = '_'.join(filename_parts)
+    status_part = f"_{status_filter.lower()}" if status_filter and status_filter != 'all' else ""
+    days_part = f"_{days_filter}days" if days_filter else ""
+    base_filename = f"po_tickets_wf{workflow_id}{status_part}{days_part}_{timestamp}"
     
     OUTPUT_CSV = os.path.join(reports_dir, f'{base_filename}.csv')
-    OUTPUT_HTML = os.path.join(reports_dir, f'{base_filename}.html')
+    OUTPUT_HTML = os.path.join(reports_dir, f'{base_filename}.html.gz' if html_gzip else f'{base_filename}.html')
     
     print("\n" + "=" * 60)
     print("                 GENERATING REPORTS")
     print("=" * 60)
     
     attachments = []
-    discovered_props = []  # Track discovered props for config generation
     
-    # Generate CSV report
+    # Open the SMTP connection in the background so the TLS handshake and login overlap report generation
+    smtp_connection = None
+    if send_email and smtp_server and (generate_csv or generate_html):
+        smtp_executor = ThreadPoolExecutor(max_workers=1)
+        smtp_connection = smtp_executor.submit(open_smtp_connection, smtp_server, smtp_port, smtp_user, smtp_password)
+        smtp_executor.shutdown(wait=False)
+    
+    # Reuse rule details cached by earlier runs
+    if use_rule_cache and (include_rule_details or include_rule_docs):
+        cached_rules = load_rule_details_cache(api_url)
+        if cached_rules:
+            print(f"\n💾 Loaded {cached_rules} cached rule details")
+    
+    # Fetch rule details once for both report types (discovered props are kept for config generation)
+    rule_details_list, sorted_prop_fields, discovered_props = collect_rule_details(api_url, tickets,
+                                                                                   include_rule_details, include_rule_docs,
+                                                                                   rule_doc_fields, rule_detail_concurrency)
+    
+    # Rule doc column names are shared by both reports
+    prop_headers = rule_doc_header_names(sorted_prop_fields)
+    
+    # Count tickets by status in one pass for the HTML and final summaries
+    status_counts = Counter(ticket.get('status') for ticket in tickets)
+    
+    # Write the CSV and HTML reports concurrently; each writer gets its own row stream and both
+    # share the rule detail lookups, so neither waits for the other to finish before starting. The
+    # executor is not a context manager because its exit would wait for the writers even after Ctrl-C
+    report_executor = ThreadPoolExecutor(max_workers=2)
+    csv_future = html_future = None
     if generate_csv:
-        result = process_tickets_to_csv(api_url, token, tickets, OUTPUT_CSV, 
-                                          include_rule_details, include_rule_docs,
-                                          rule_detail_fields, rule_doc_fields)
-        if isinstance(result, tuple):
-            csv_count, csv_discovered_props = result
-            if not discovered_props:
-                discovered_props = csv_discovered_props
-        else:
-            csv_count = result
+        print(f"\n📝 Generating CSV report...")
+        rows = iter_enriched_tickets(api_url, tickets, rule_details_list, include_rule_details,
+                                     include_rule_docs, rule_detail_fields, rule_detail_concurrency)
+        csv_future = report_executor.submit(process_tickets_to_csv, rows, OUTPUT_CSV, include_rule_details,
+                                            include_rule_docs, rule_detail_fields, sorted_prop_fields,
+                                            prop_headers)
+    if generate_html:
+        print(f"\n📊 Generating HTML report...")
+        rows = iter_enriched_tickets(api_url, tickets, rule_details_list, include_rule_details,
+                                     include_rule_docs, rule_detail_fields, rule_detail_concurrency)
+        html_future = report_executor.submit(generate_html_report, rows, OUTPUT_HTML, status_counts,
+                                             include_rule_details, include_rule_docs, rule_detail_fields,
+                                             sorted_prop_fields, prop_headers, html_gzip, report_time_str)
+    report_executor.shutdown(wait=False)
+    
+    # Collect results in a fixed order so console output and attachments stay CSV first, then HTML
+    if csv_future:
+        csv_count, csv_bytes, summary_lines = csv_future.result()
+        print('\n'.join(summary_lines))
         logging.info(f"CSV report generated: {OUTPUT_CSV}")
         attachments.append(OUTPUT_CSV)
-    
-    # Generate HTML report
-    if generate_html:
-        result = generate_html_report(api_url, token, tickets, OUTPUT_HTML, 
-                                         include_rule_details, include_rule_docs,
-                                         rule_detail_fields, rule_doc_fields)
-        if isinstance(result, tuple):
-            html_count, html_discovered_props = result
-            if not discovered_props:
-                discovered_props = html_discovered_props
-        else:
-            html_count = result
+    if html_future:
+        html_count, html_bytes, summary_lines = html_future.result()
+        print('\n'.join(summary_lines))
         logging.info(f"HTML report generated: {OUTPUT_HTML}")
         attachments.append(OUTPUT_HTML)
     
+    # Save rule details for later runs
+    if use_rule_cache and (include_rule_details or include_rule_docs):
+        save_rule_details_cache(api_url, tickets, rule_cache_ttl, rule_cache_closed_ttl)
+    
     # Generate config file if requested
     if args.generate_config:
         generated_config = {
@@ -1658,8 +2145,12 @@ if __name__ == "__main__":
             "days": days_filter,
             "csv": generate_csv,
             "html": generate_html,
+            "html_gzip": html_gzip,
             "include_rule_details": include_rule_details,
-            "include_rule_docs": include_rule_docs
+            "include_rule_docs": include_rule_docs,
+            "rule_detail_concurrency": rule_detail_concurrency,
+            "rule_cache_ttl": rule_cache_ttl,
+            "rule_cache_closed_ttl": rule_cache_closed_ttl
         }
         
         # Add field selections
@@ -1693,7 +2184,7 @@ if __name__ == "__main__":
         
         # Add metadata
         generated_config["_metadata"] = {
-            "generated_on": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "generated_on": report_time_str,
             "total_tickets_found": len(tickets),
             "note": "Password fields need to be filled in manually for security"
         }
@@ -1702,10 +2193,10 @@ if __name__ == "__main__":
     
     # Send email if requested
     if send_email and attachments:
-        subject = f"Policy Optimizer Tickets Report - {datetime.now().strftime('%Y-%m-%d')}"
+        subject = f"Policy Optimizer Tickets Report - {report_time_str[:10]}"
         body = f"""FireMon Policy Optimizer Tickets Report
 
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+Generated: {report_time_str}
 Workflow ID: {workflow_id}
 Total Tickets: {len(tickets)}
 Status Filter: {status_filter}
@@ -1714,7 +2205,7 @@ Date Filter: {"Last " + str(days_filter) + " days" if days_filter else "All time
 Please find the attached report(s).
 """
         send_email_report(smtp_server, smtp_port, smtp_user, smtp_password,
-                         email_recipients, subject, body, attachments)
+                         email_recipients, subject, body, attachments, smtp_connection)
     
     # Final summary
     print("\n" + "=" * 60)
@@ -1725,9 +2216,9 @@ Please find the attached report(s).
     print(f"   • Total tickets processed: {len(tickets)}")
     
     # Status breakdown
-    review_count = sum(1 for t in tickets if t.get('status') == 'Review')
-    completed_count = sum(1 for t in tickets if t.get('status') == 'Completed')
-    cancelled_count = sum(1 for t in tickets if t.get('status') == 'Cancelled')
+    review_count = status_counts['Review']
+    completed_count = status_counts['Completed']
+    cancelled_count = status_counts['Cancelled']
     
     print(f"   • In Review: {review_count}")
     print(f"   • Completed: {completed_count}")
@@ -1738,12 +2229,12 @@ Please find the attached report(s).
     if generate_csv:
         print(f"\n   📄 CSV Report:")
         print(f"      Location: {OUTPUT_CSV}")
-        print(f"      Size: {os.path.getsize(OUTPUT_CSV):,} bytes")
+        print(f"      Size: {csv_bytes:,} bytes")
     
     if generate_html:
         print(f"\n   🌐 HTML Report:")
         print(f"      Location: {OUTPUT_HTML}")
-        print(f"      Size: {os.path.getsize(OUTPUT_HTML):,} bytes")
+        print(f"      Size: {html_bytes:,} bytes")
     
     print(f"\n   📁 Reports saved in: {os.path.abspath(reports_dir)}/")
     